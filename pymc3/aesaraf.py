@@ -13,17 +13,7 @@
 #   limitations under the License.
 import warnings
 
-from typing import (
-    Callable,
-    Dict,
-    Generator,
-    Iterable,
-    List,
-    Optional,
-    Set,
-    Tuple,
-    Union,
-)
+from typing import Callable, Dict, Generator, Iterable, List, Optional, Tuple, Union
 
 import aesara
 import aesara.tensor as at
@@ -242,7 +232,7 @@ def extract_obs_data(x: TensorVariable) -> np.ndarray:
 def walk_model(
     graphs: Iterable[TensorVariable],
     walk_past_rvs: bool = False,
-    stop_at_vars: Optional[Set[TensorVariable]] = None,
+    stop_at_vars: Optional[Iterable[TensorVariable]] = None,
     expand_fn: Callable[[TensorVariable], Iterable[TensorVariable]] = lambda var: [],
 ) -> Generator[TensorVariable, None, None]:
     """Walk model graphs and yield their nodes.
@@ -256,12 +246,12 @@ def walk_model(
     walk_past_rvs
         If ``True``, the walk will not terminate at ``RandomVariable``s.
     stop_at_vars
-        A list of variables at which the walk will terminate.
+        The variables at which the walk will terminate. They are compared
+        by identity.
     expand_fn
         A function that returns the next variable(s) to be traversed.
     """
-    if stop_at_vars is None:
-        stop_at_vars = set()
+    stop_at_ids = frozenset(map(id, stop_at_vars)) if stop_at_vars else frozenset()
 
     def expand(var):
         new_vars = expand_fn(var)
@@ -269,7 +259,7 @@ def walk_model(
         if (
             var.owner
             and (walk_past_rvs or not isinstance(var.owner.op, RandomVariable))
-            and (var not in stop_at_vars)
+            and (id(var) not in stop_at_ids)
         ):
             new_vars.extend(reversed(var.owner.inputs))
 
@@ -876,14 +866,27 @@ def take_along_axis(arr, indices, axis=0):
     return arr[_make_along_axis_idx(arr_shape, indices, _axis)]
 
 
+# Maps `id(mode)` to the mode and its variant with `random_make_inplace` enabled.
+# The modes are kept alive, so their ids cannot be reused by other objects.
+_inplace_modes: Dict[int, Tuple[Mode, Mode]] = {}
+
+
 def compile_rv_inplace(inputs, outputs, mode=None, **kwargs):
     """Use ``aesara.function`` with the random_make_inplace optimization always enabled.
 
     Using this function ensures that compiled functions containing random
     variables will produce new samples on each call.
     """
-    mode = get_mode(mode)
-    opt_qry = mode.provided_optimizer.including("random_make_inplace")
-    mode = Mode(linker=mode.linker, optimizer=opt_qry)
-    aesara_function = aesara.function(inputs, outputs, mode=mode, **kwargs)
+    base_mode = get_mode(mode)
+    cached = _inplace_modes.get(id(base_mode))
+    if cached is not None:
+        inplace_mode = cached[1]
+    else:
+        opt_qry = base_mode.provided_optimizer.including("random_make_inplace")
+        inplace_mode = Mode(linker=base_mode.linker, optimizer=opt_qry)
+        # Only named/default modes are cached, so that passing a fresh `Mode`
+        # on every call does not make the cache grow without bounds.
+        if mode is None or isinstance(mode, str):
+            _inplace_modes[id(base_mode)] = (base_mode, inplace_mode)
+    aesara_function = aesara.function(inputs, outputs, mode=inplace_mode, **kwargs)
     return aesara_function
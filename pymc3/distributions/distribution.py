@@ -38,6 +38,7 @@ from pymc3.distributions.shape_utils import (
     convert_shape,
     convert_size,
     find_size,
+    infer_implied_ndim,
     maybe_resize,
     resize_from_dims,
     resize_from_observed,
@@ -59,26 +60,73 @@ vectorized_ppc = contextvars.ContextVar(
 
 PLATFORM = sys.platform
 
+# Whether each supported repr formatting is LaTeX and whether it lists the parameters
+_REPR_FORMATTINGS = {
+    "latex": (True, False),
+    "plain": (False, False),
+    "latex_with_params": (True, True),
+    "plain_with_params": (False, True),
+}
+_SUPPORTED_FORMATTINGS = frozenset(_REPR_FORMATTINGS)
+
+# Whether sampling processes will be forked. `get_start_method(allow_none=True)`
+# is used instead of `get_context()`, which would fix the start method on import.
+_IS_FORK_CTX = PLATFORM == "linux" and multiprocessing.get_start_method(allow_none=True) in {
+    None,
+    "fork",
+}
+
 
 class _Unpickling:
     pass
 
 
+class _DeprecatedRandom:
+    """Wraps the `random` method of old v3 `Distribution`s to warn when it is called."""
+
+    __slots__ = ("_random",)
+
+    def __init__(self, random):
+        self._random = random
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return types.MethodType(self, instance)
+
+    def __call__(self, *args, **kwargs):
+        warnings.warn(
+            "The old `Distribution.random` interface is deprecated.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._random(*args, **kwargs)
+
+
+def _make_logp_dispatch(class_logp):
+    """Wrap a `Distribution.logp` into a function for the `_logp` dispatcher."""
+
+    def logp(op, var, rvs_to_values, *dist_params, **kwargs):
+        return class_logp(rvs_to_values.get(var, var), *dist_params, **kwargs)
+
+    return logp
+
+
+def _make_logcdf_dispatch(class_logcdf):
+    """Wrap a `Distribution.logcdf` into a function for the `_logcdf` dispatcher."""
+
+    def logcdf(op, var, rvs_to_values, *dist_params, **kwargs):
+        return class_logcdf(rvs_to_values.get(var, var), *dist_params, **kwargs)
+
+    return logcdf
+
+
 class DistributionMeta(ABCMeta):
     def __new__(cls, name, bases, clsdict):
 
         # Forcefully deprecate old v3 `Distribution`s
         if "random" in clsdict:
-
-            def _random(*args, **kwargs):
-                warnings.warn(
-                    "The old `Distribution.random` interface is deprecated.",
-                    DeprecationWarning,
-                    stacklevel=2,
-                )
-                return clsdict["random"](*args, **kwargs)
-
-            clsdict["random"] = _random
+            clsdict["random"] = _DeprecatedRandom(clsdict["random"])
 
         rv_op = clsdict.setdefault("rv_op", None)
         rv_type = None
@@ -93,19 +141,13 @@ class DistributionMeta(ABCMeta):
 
             class_logp = clsdict.get("logp")
             if class_logp:
-
-                @_logp.register(rv_type)
-                def logp(op, var, rvs_to_values, *dist_params, **kwargs):
-                    value_var = rvs_to_values.get(var, var)
-                    return class_logp(value_var, *dist_params, **kwargs)
+                rv_type._pymc_logp = _logp.register(rv_type)(_make_logp_dispatch(class_logp))
 
             class_logcdf = clsdict.get("logcdf")
             if class_logcdf:
-
-                @_logcdf.register(rv_type)
-                def logcdf(op, var, rvs_to_values, *dist_params, **kwargs):
-                    value_var = rvs_to_values.get(var, var)
-                    return class_logcdf(value_var, *dist_params, **kwargs)
+                rv_type._pymc_logcdf = _logcdf.register(rv_type)(
+                    _make_logcdf_dispatch(class_logcdf)
+                )
 
             # Register the Aesara `RandomVariable` type as a subclass of this
             # `Distribution` type.
@@ -192,6 +234,11 @@ class Distribution(metaclass=DistributionMeta):
         if rng is None:
             rng = model.next_rng()
 
+        if dims is None and observed is None and initval is None:
+            # Nothing can imply a resize, so the RV from `.dist()` is final.
+            rv_out = cls.dist(*args, rng=rng, initval=None, **kwargs)
+            return model.register_rv(rv_out, name, None, total_size, transform=transform)
+
         if dims is not None and "shape" in kwargs:
             raise ValueError(
                 f"Passing both `dims` ({dims}) and `shape` ({kwargs['shape']}) is not supported!"
@@ -277,8 +324,12 @@ class Distribution(metaclass=DistributionMeta):
         shape = convert_shape(shape)
         size = convert_size(size)
 
+        ndim_implied = None
+        if shape is not None and cls.rv_op.ndim_supp > 0:
+            ndim_implied = infer_implied_ndim(dist_params, cls.rv_op)
+
         create_size, ndim_expected, ndim_batch, ndim_supp = find_size(
-            shape=shape, size=size, ndim_supp=cls.rv_op.ndim_supp
+            shape=shape, size=size, ndim_supp=cls.rv_op.ndim_supp, ndim_implied=ndim_implied
         )
         # Create the RV with a `size` right away.
         # This is not necessarily the final result.
@@ -321,7 +372,17 @@ class Distribution(metaclass=DistributionMeta):
         of __init__, but can be overwritten if necessary (e.g. to avoid including
         "sd" and "tau").
         """
-        return inspect.getfullargspec(self.__init__).args[1:]
+        cls = type(self)
+        names = cls.__dict__.get("_repr_param_names")
+        if names is None:
+            code = getattr(cls.__init__, "__code__", None)
+            if code is not None:
+                names = list(code.co_varnames[1 : code.co_argcount])
+            else:
+                names = inspect.getfullargspec(self.__init__).args[1:]
+            # Stored on the class itself, so subclasses compute their own names.
+            cls._repr_param_names = names
+        return names
 
     def _distr_name_for_repr(self):
         return self.__class__.__name__
@@ -344,34 +405,56 @@ class Distribution(metaclass=DistributionMeta):
             dist = self
         if name is None:
             name = "[unnamed]"
-        supported_formattings = {"latex", "plain", "latex_with_params", "plain_with_params"}
-        if not formatting in supported_formattings:
-            raise ValueError(f"Unsupported formatting ''. Choose one of {supported_formattings}.")
+        if formatting not in _SUPPORTED_FORMATTINGS:
+            raise ValueError(
+                f"Unsupported formatting ''. Choose one of {set(_SUPPORTED_FORMATTINGS)}."
+            )
+        is_latex, with_params = _REPR_FORMATTINGS[formatting]
+
+        head, mid, tail = dist._repr_template(formatting)
+        if not with_params:
+            return head + name + mid
 
         param_names = self._distr_parameters_for_repr()
-        param_values = [
+        param_values = (
             get_repr_for_variable(getattr(dist, x), formatting=formatting) for x in param_names
-        ]
-
-        if "latex" in formatting:
+        )
+        if is_latex:
             param_string = ",~".join(
-                [fr"\mathit{{{name}}}={value}" for name, value in zip(param_names, param_values)]
-            )
-            if formatting == "latex_with_params":
-                return r"$\text{{{var_name}}} \sim \text{{{distr_name}}}({params})$".format(
-                    var_name=name, distr_name=dist._distr_name_for_repr(), params=param_string
-                )
-            return r"$\text{{{var_name}}} \sim \text{{{distr_name}}}$".format(
-                var_name=name, distr_name=dist._distr_name_for_repr()
+                r"\mathit{" + pname + "}=" + value
+                for pname, value in zip(param_names, param_values)
             )
         else:
-            # one of the plain formattings
             param_string = ", ".join(
-                [f"{name}={value}" for name, value in zip(param_names, param_values)]
+                pname + "=" + value for pname, value in zip(param_names, param_values)
             )
-            if formatting == "plain_with_params":
-                return f"{name} ~ {dist._distr_name_for_repr()}({param_string})"
-            return f"{name} ~ {dist._distr_name_for_repr()}"
+        return head + name + mid + param_string + tail
+
+    def _repr_template(self, formatting):
+        """Return the ``(head, mid, tail)`` pieces that surround the variable name
+        and the parameter string in a representation of this distribution.
+
+        The pieces only depend on the class and the formatting, so they are
+        built once and stored on the class.
+        """
+        cls = type(self)
+        templates = cls.__dict__.get("_repr_templates")
+        if templates is None:
+            templates = {}
+            cls._repr_templates = templates
+        template = templates.get(formatting)
+        if template is None:
+            distr_name = self._distr_name_for_repr()
+            if formatting == "latex_with_params":
+                template = (r"$\text{", r"} \sim \text{" + distr_name + "}(", ")$")
+            elif formatting == "latex":
+                template = (r"$\text{", r"} \sim \text{" + distr_name + "}$", "")
+            elif formatting == "plain_with_params":
+                template = ("", " ~ " + distr_name + "(", ")")
+            else:
+                template = ("", " ~ " + distr_name, "")
+            templates[formatting] = template
+        return template
 
     def __str__(self, **kwargs):
         try:
@@ -516,14 +599,16 @@ class DensityDist(Distribution):
             dtype = aesara.config.floatX
         super().__init__(shape, dtype, initval, *args, **kwargs)
         self.logp = logp
-        if type(self.logp) == types.MethodType:
+        # Lazily filled with ``(logp, dill.dumps(logp))`` by ``__getstate__``
+        self._logp_pickle = None
+        if type(self.logp) is types.MethodType and not _IS_FORK_CTX:
             if PLATFORM != "linux":
                 warnings.warn(
                     "You are passing a bound method as logp for DensityDist, this can lead to "
                     "errors when sampling on platforms other than Linux. Consider using a "
                     "plain function instead, or subclass Distribution."
                 )
-            elif type(multiprocessing.get_context()) != multiprocessing.context.ForkContext:
+            else:
                 warnings.warn(
                     "You are passing a bound method as logp for DensityDist, this can lead to "
                     "errors when sampling when multiprocessing cannot rely on forking. Consider using a "
@@ -537,21 +622,31 @@ class DensityDist(Distribution):
         # We use dill to serialize the logp function, as this is almost
         # always defined in the notebook and won't be pickled correctly.
         # Fix https://github.com/pymc-devs/pymc3/issues/3844
-        try:
-            logp = dill.dumps(self.logp)
-        except RecursionError as err:
-            if type(self.logp) == types.MethodType:
-                raise ValueError(
-                    "logp for DensityDist is a bound method, leading to RecursionError while serializing"
-                ) from err
-            else:
-                raise err
+        # The serialized blob is reused as long as `logp` was not reassigned,
+        # because every worker process of a multi-chain run pickles it again.
+        cached = getattr(self, "_logp_pickle", None)
+        if cached is not None and cached[0] is self.logp:
+            logp = cached[1]
+        else:
+            try:
+                logp = dill.dumps(self.logp)
+            except RecursionError as err:
+                if type(self.logp) is types.MethodType:
+                    raise ValueError(
+                        "logp for DensityDist is a bound method, leading to RecursionError while serializing"
+                    ) from err
+                else:
+                    raise err
+            self._logp_pickle = (self.logp, logp)
         vals = self.__dict__.copy()
         vals["logp"] = logp
+        vals["_logp_pickle"] = None
         return vals
 
     def __setstate__(self, vals):
-        vals["logp"] = dill.loads(vals["logp"])
+        logp = dill.loads(vals["logp"])
+        vals["_logp_pickle"] = (logp, vals["logp"])
+        vals["logp"] = logp
         self.__dict__ = vals
 
     def _distr_parameters_for_repr(self):
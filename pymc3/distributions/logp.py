@@ -197,10 +197,14 @@ def logpt(
     tmp_rv_values = rv_values.copy()
     tmp_rv_values[rv_var] = rv_var
 
+    # `Distribution` classes also attach their dispatch functions to the exact
+    # `Op` type, which avoids going through the `singledispatch` lookup.
+    op_attrs = type(rv_node.op).__dict__
     if not cdf:
-        logp_var = _logp(rv_node.op, rv_var, tmp_rv_values, *dist_params, **kwargs)
+        logp_fn = op_attrs.get("_pymc_logp", _logp)
     else:
-        logp_var = _logcdf(rv_node.op, rv_var, tmp_rv_values, *dist_params, **kwargs)
+        logp_fn = op_attrs.get("_pymc_logcdf", _logcdf)
+    logp_var = logp_fn(rv_node.op, rv_var, tmp_rv_values, *dist_params, **kwargs)
 
     transform = getattr(rv_value_var.tag, "transform", None) if rv_value_var else None
 
@@ -20,11 +20,12 @@ samples from probability distributions for stochastic nodes in PyMC.
 
 import warnings
 
+from functools import lru_cache
 from typing import Optional, Sequence, Tuple, Union
 
 import numpy as np
 
-from aesara.graph.basic import Variable
+from aesara.graph.basic import Constant, Variable
 from aesara.tensor.var import TensorVariable
 
 from pymc3.aesaraf import change_rv_size, pandas_to_array
@@ -55,6 +56,9 @@ def to_tuple(shape):
     """
     if shape is None:
         return tuple()
+    int_shape = _int_shape_or_none(shape)
+    if int_shape is not None:
+        return int_shape
     temp = np.atleast_1d(shape)
     if temp.size == 0:
         return tuple()
@@ -62,7 +66,22 @@ def to_tuple(shape):
         return tuple(temp)
 
 
+def _int_shape_or_none(shape):
+    """Return plain ints and tuples of ints as a shape tuple, and None for anything else.
+
+    These are the common case and can be handled without creating an array.
+    """
+    if type(shape) is int:
+        return (shape,)
+    if type(shape) is tuple and all(type(s) is int for s in shape):
+        return shape
+    return None
+
+
 def _check_shape_type(shape):
+    int_shape = _int_shape_or_none(shape)
+    if int_shape is not None:
+        return int_shape
     out = []
     try:
         shape = np.atleast_1d(shape)
@@ -425,39 +444,65 @@ StrongDims = Sequence[Union[str, None]]
 StrongSize = Union[TensorVariable, Tuple[Union[int, TensorVariable], ...]]
 
 
-def convert_dims(dims: Dims) -> Optional[WeakDims]:
-    """ Process a user-provided dims variable into None or a valid dims tuple. """
+_NoneType = type(None)
+_EllipsisType = type(Ellipsis)
+_SEQUENCE_TYPES = (list, tuple)
+_CACHEABLE_ITEM_TYPES = frozenset({int, str, _NoneType, _EllipsisType})
+
+
+def _is_cacheable(value) -> bool:
+    """Whether ``value`` is built only from ints, strings, None and Ellipsis.
+
+    Only such values can safely be used as keys for the conversion caches,
+    because `Variable`s hash by identity and not by value.
+    """
+    if isinstance(value, tuple):
+        return all(type(v) in _CACHEABLE_ITEM_TYPES for v in value)
+    return type(value) in _CACHEABLE_ITEM_TYPES
+
+
+def _valid_ellipsis_position(items: Union[None, Variable, Sequence]) -> bool:
+    """Whether an Ellipsis in ``items`` only appears in the last position."""
+    if items is None or isinstance(items, Variable):
+        return True
+    last = len(items) - 1
+    for i, v in enumerate(items):
+        if v is Ellipsis and i != last:
+            return False
+    return True
+
+
+def _convert_dims(dims: Dims) -> Optional[WeakDims]:
     if dims is None:
         return None
 
     if isinstance(dims, str):
         dims = (dims,)
-    elif isinstance(dims, (list, tuple)):
+    elif isinstance(dims, _SEQUENCE_TYPES):
         dims = tuple(dims)
     else:
         raise ValueError(f"The `dims` parameter must be a tuple, str or list. Actual: {type(dims)}")
 
-    if any(d == Ellipsis for d in dims[:-1]):
+    if not _valid_ellipsis_position(dims):
         raise ValueError(f"Ellipsis in `dims` may only appear in the last position. Actual: {dims}")
 
     return dims
 
 
-def convert_shape(shape: Shape) -> Optional[WeakShape]:
-    """ Process a user-provided shape variable into None or a valid shape object. """
+def _convert_shape(shape: Shape) -> Optional[WeakShape]:
     if shape is None:
         return None
 
     if isinstance(shape, int) or (isinstance(shape, TensorVariable) and shape.ndim == 0):
         shape = (shape,)
-    elif isinstance(shape, (list, tuple)):
+    elif isinstance(shape, _SEQUENCE_TYPES):
         shape = tuple(shape)
     else:
         raise ValueError(
             f"The `shape` parameter must be a tuple, TensorVariable, int or list. Actual: {type(shape)}"
         )
 
-    if isinstance(shape, tuple) and any(s == Ellipsis for s in shape[:-1]):
+    if not _valid_ellipsis_position(shape):
         raise ValueError(
             f"Ellipsis in `shape` may only appear in the last position. Actual: {shape}"
         )
@@ -465,26 +510,63 @@ def convert_shape(shape: Shape) -> Optional[WeakShape]:
     return shape
 
 
-def convert_size(size: Size) -> Optional[StrongSize]:
-    """ Process a user-provided size variable into None or a valid size object. """
+def _convert_size(size: Size) -> Optional[StrongSize]:
     if size is None:
         return None
 
     if isinstance(size, int) or (isinstance(size, TensorVariable) and size.ndim == 0):
         size = (size,)
-    elif isinstance(size, (list, tuple)):
+    elif isinstance(size, _SEQUENCE_TYPES):
         size = tuple(size)
     else:
         raise ValueError(
             f"The `size` parameter must be a tuple, TensorVariable, int or list. Actual: {type(size)}"
         )
 
-    if isinstance(size, tuple) and Ellipsis in size:
+    if isinstance(size, tuple) and any(s is Ellipsis for s in size):
         raise ValueError(f"The `size` parameter cannot contain an Ellipsis. Actual: {size}")
 
     return size
 
 
+_convert_dims_cached = lru_cache(maxsize=1024)(_convert_dims)
+_convert_shape_cached = lru_cache(maxsize=1024)(_convert_shape)
+_convert_size_cached = lru_cache(maxsize=1024)(_convert_size)
+
+
+def convert_dims(dims: Dims) -> Optional[WeakDims]:
+    """ Process a user-provided dims variable into None or a valid dims tuple. """
+    if dims is None:
+        return None
+    if isinstance(dims, list):
+        dims = tuple(dims)
+    if _is_cacheable(dims):
+        return _convert_dims_cached(dims)
+    return _convert_dims(dims)
+
+
+def convert_shape(shape: Shape) -> Optional[WeakShape]:
+    """ Process a user-provided shape variable into None or a valid shape object. """
+    if shape is None:
+        return None
+    if isinstance(shape, list):
+        shape = tuple(shape)
+    if _is_cacheable(shape):
+        return _convert_shape_cached(shape)
+    return _convert_shape(shape)
+
+
+def convert_size(size: Size) -> Optional[StrongSize]:
+    """ Process a user-provided size variable into None or a valid size object. """
+    if size is None:
+        return None
+    if isinstance(size, list):
+        size = tuple(size)
+    if _is_cacheable(size):
+        return _convert_size_cached(size)
+    return _convert_size(size)
+
+
 def resize_from_dims(
     dims: WeakDims, ndim_implied: int, model
 ) -> Tuple[int, StrongSize, StrongDims]:
@@ -514,15 +596,18 @@ def resize_from_dims(
 
     ndim_resize = len(dims) - ndim_implied
 
+    dim_lengths = model.dim_lengths
+    resize_dims = dims[:ndim_resize]
+
     # All resize dims must be known already (numerically or symbolically).
-    unknowndim_resize_dims = set(dims[:ndim_resize]) - set(model.dim_lengths)
+    unknowndim_resize_dims = [dname for dname in resize_dims if dname not in dim_lengths]
     if unknowndim_resize_dims:
         raise KeyError(
-            f"Dimensions {unknowndim_resize_dims} are unknown to the model and cannot be used to specify a `size`."
+            f"Dimensions {set(unknowndim_resize_dims)} are unknown to the model and cannot be used to specify a `size`."
         )
 
     # The numeric/symbolic resize tuple can be created using model.RV_dim_lengths
-    resize_shape = tuple(model.dim_lengths[dname] for dname in dims[:ndim_resize])
+    resize_shape = tuple(map(dim_lengths.__getitem__, resize_dims))
     return ndim_resize, resize_shape, dims
 
 
@@ -550,11 +635,50 @@ def resize_from_observed(
     if not hasattr(observed, "shape"):
         observed = pandas_to_array(observed)
     ndim_resize = observed.ndim - ndim_implied
-    resize_shape = tuple(observed.shape[d] for d in range(ndim_resize))
+    if isinstance(observed.shape, tuple):
+        resize_shape = observed.shape[: max(ndim_resize, 0)]
+    else:
+        resize_shape = tuple(observed.shape[d] for d in range(ndim_resize))
     return ndim_resize, resize_shape, observed
 
 
-def find_size(shape=None, size=None, ndim_supp=None):
+def infer_implied_ndim(dist_params, rv_op) -> Optional[int]:
+    """Determines the number of dimensions that the parameters alone imply for an RV.
+
+    Parameters
+    ----------
+    dist_params : array-like
+        Input parameters to the RandomVariable
+    rv_op : RandomVariable
+        The RandomVariable `Op` that the parameters are passed to
+
+    Returns
+    -------
+    ndim_implied : int or None
+        Number of support and batch dimensions of the RV when it is created without
+        a `size`, or None if that can not be determined from the parameters.
+    """
+    ndims_params = rv_op.ndims_params
+    if len(ndims_params) != len(dist_params):
+        return None
+    ndim_batch = 0
+    for param, ndim_param in zip(dist_params, ndims_params):
+        ndim = getattr(param, "ndim", None)
+        if ndim is None:
+            try:
+                ndim = np.ndim(param)
+            except Exception:
+                return None
+        ndim_batch = max(ndim_batch, ndim - ndim_param)
+    return ndim_batch + rv_op.ndim_supp
+
+
+def find_size(
+    shape: Optional[WeakShape] = None,
+    size: Optional[StrongSize] = None,
+    ndim_supp: Optional[int] = None,
+    ndim_implied: Optional[int] = None,
+) -> Tuple[Optional[StrongSize], Optional[int], Optional[int], Optional[int]]:
     """Determines the size keyword argument for creating a Distribution.
 
     Parameters
@@ -566,6 +690,8 @@ def find_size(shape=None, size=None, ndim_supp=None):
     ndim_supp : int
         The support dimension of the distribution.
         0 if a univariate distribution, 1 if a multivariate distribution.
+    ndim_implied : int, optional
+        Number of dimensions implied by the parameters (see ``infer_implied_ndim``).
 
     Returns
     -------
@@ -591,17 +717,32 @@ def find_size(shape=None, size=None, ndim_supp=None):
             # Create the RV with its implied shape and resize later
             create_size = None
         else:
-            ndim_expected = len(tuple(shape))
+            shape = shape if isinstance(shape, tuple) else tuple(shape)
+            ndim_expected = len(shape)
             ndim_batch = ndim_expected - ndim_supp
-            create_size = tuple(shape)[:ndim_batch]
+            if ndim_supp > 0 and ndim_implied is not None and ndim_implied > ndim_supp:
+                # Multivariate RVs put their `size` in front of the batch dimensions
+                # implied by the parameters, which would duplicate those dimensions.
+                # Create the RV with its implied shape and resize later.
+                create_size = None
+            else:
+                create_size = shape[:ndim_batch]
     elif size is not None:
-        ndim_expected = ndim_supp + len(tuple(size))
-        ndim_batch = ndim_expected - ndim_supp
+        ndim_batch = len(size if isinstance(size, tuple) else tuple(size))
+        ndim_expected = ndim_supp + ndim_batch
         create_size = size
 
     return create_size, ndim_expected, ndim_batch, ndim_supp
 
 
+def _created_without_size(rv_out) -> bool:
+    """Whether the `size` input of the RandomVariable node of `rv_out` is empty."""
+    if rv_out.owner is None:
+        return False
+    size = rv_out.owner.inputs[1]
+    return isinstance(size, Constant) and size.data.size == 0
+
+
 def maybe_resize(
     rv_out,
     rv_op,
@@ -649,8 +790,10 @@ def maybe_resize(
             rv_out = change_rv_size(rv_var=rv_out, new_size=shape[:-1], expand=True)
         else:
             # This is rare, but happens, for example, with MvNormal(np.ones((2, 3)), np.eye(3), shape=(2, 3)).
-            # Recreate the RV without passing `size` to created it with just the implied dimensions.
-            rv_out = rv_op(*dist_params, size=None, **kwargs)
+            # Recreate the RV without passing `size` to created it with just the implied dimensions,
+            # unless it was already created like that.
+            if not _created_without_size(rv_out):
+                rv_out = rv_op(*dist_params, size=None, **kwargs)
 
             # Now resize by any remaining "extra" dimensions that were not implied from support and parameters
             if rv_out.ndim < ndim_expected:
@@ -668,7 +811,7 @@ def maybe_resize(
     # it should based on `size` and `RVOp.ndim_supp`.
     if size is not None and ndims_unexpected:
         warnings.warn(
-            f"You may have expected a ({len(tuple(size))}+{ndim_supp})-dimensional RV, but the resulting RV will be {ndim_actual}-dimensional."
+            f"You may have expected a ({ndim_batch}+{ndim_supp})-dimensional RV, but the resulting RV will be {ndim_actual}-dimensional."
             ' To silence this warning use `warnings.simplefilter("ignore", pm.ShapeWarning)`.',
             ShapeWarning,
         )
@@ -13,10 +13,12 @@
 #   limitations under the License.
 
 import collections
+import inspect
 import itertools
 import threading
 import warnings
 
+from collections.abc import Mapping
 from sys import modules
 from typing import (
     TYPE_CHECKING,
@@ -37,14 +39,16 @@ import aesara.tensor as at
 import numpy as np
 import scipy.sparse as sps
 
+from aesara.compile.mode import get_mode
 from aesara.compile.sharedvalue import SharedVariable
 from aesara.gradient import grad
-from aesara.graph.basic import Constant, Variable, graph_inputs
+from aesara.graph.basic import Constant, Variable, clone_replace, graph_inputs
 from aesara.graph.fg import FunctionGraph
 from aesara.tensor.random.opt import local_subtensor_rv_lift
 from aesara.tensor.random.var import RandomStateSharedVariable
 from aesara.tensor.sharedvar import ScalarSharedVariable
 from aesara.tensor.var import TensorVariable
+from cachetools import LRUCache
 from pandas import Series
 
 from pymc3.aesaraf import (
@@ -60,7 +64,14 @@ from pymc3.data import GenTensorVariable, Minibatch
 from pymc3.distributions import logp_transform, logpt, logpt_sum
 from pymc3.exceptions import ImputationWarning, SamplingError, ShapeError
 from pymc3.math import flatten_list
-from pymc3.util import UNSET, WithMemoization, get_var_name, treedict, treelist
+from pymc3.util import (
+    UNSET,
+    WithMemoization,
+    get_var_name,
+    locally_cachedmethod,
+    treedict,
+    treelist,
+)
 from pymc3.vartypes import continuous_types, discrete_types, typefilter
 
 __all__ = [
@@ -141,18 +152,19 @@ class ContextMeta(type):
         "Add __enter__ and __exit__ methods to the class."
 
         def __enter__(self):
-            self.__class__.context_class.get_contexts().append(self)
-            # self._aesara_config is set in Model.__new__
+            type(self).get_contexts().append(self)
+            # self._aesara_config is set in Model.__new__. Most models don't
+            # change any flags, so skip the `change_flags` context entirely.
             self._config_context = None
-            if hasattr(self, "_aesara_config"):
-                self._config_context = aesara.config.change_flags(**self._aesara_config)
+            aesara_config = getattr(self, "_aesara_config", None)
+            if aesara_config:
+                self._config_context = aesara.config.change_flags(**aesara_config)
                 self._config_context.__enter__()
             return self
 
         def __exit__(self, typ, value, traceback):  # pylint: disable=unused-argument
-            self.__class__.context_class.get_contexts().pop()
-            # self._aesara_config is set in Model.__new__
-            if self._config_context:
+            type(self).get_contexts().pop()
+            if self._config_context is not None:
                 self._config_context.__exit__(typ, value, traceback)
 
         dct[__enter__.__name__] = __enter__
@@ -200,6 +212,11 @@ class ContextMeta(type):
         # no race-condition here, contexts is a thread-local object
         # be sure not to override contexts in a subclass however!
         context_class = cls.context_class
+        try:
+            return context_class.contexts.stack
+        except AttributeError:
+            # First access from this thread (or at all)
+            pass
         assert isinstance(
             context_class, type
         ), f"Name of context class, {context_class} was not resolvable to a class"
@@ -263,6 +280,31 @@ def modelcontext(model: Optional["Model"]) -> "Model":
     return model
 
 
+class _InverseMap(Mapping):
+    """Read-only inverse of a mapping, built when it is first looked up.
+
+    The inverse is rebuilt when the number of items in the mapping changes.
+    """
+
+    def __init__(self, mapping):
+        self.mapping = mapping
+        self._inverse = None
+
+    def _get_inverse(self):
+        if self._inverse is None or self._inverse[0] != len(self.mapping):
+            self._inverse = (len(self.mapping), {v: k for k, v in self.mapping.items()})
+        return self._inverse[1]
+
+    def __getitem__(self, key):
+        return self._get_inverse()[key]
+
+    def __iter__(self):
+        return iter(self._get_inverse())
+
+    def __len__(self):
+        return len(self.mapping)
+
+
 class Factor:
     """Common functionality for objects with a log probability density
     associated with them.
@@ -271,10 +313,21 @@ class Factor:
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+    @locally_cachedmethod
+    def _compiled_logp_fn(self, fn_name, logp, derivative=None, vars=None):
+        """Compile the log-probability graph, or one of its derivatives, once.
+
+        Entries are keyed by the graph itself, which only changes when
+        variables are added to the model.
+        """
+        if derivative is not None:
+            logp = derivative(logp, vars)
+        return getattr(self.model, fn_name)(logp)
+
     @property
     def logp(self):
         """Compiled log probability density function"""
-        return self.model.fn(self.logpt)
+        return self._compiled_logp_fn("fn", self.logpt)
 
     @property
     def logp_elemwise(self):
@@ -282,48 +335,48 @@ class Factor:
 
     def dlogp(self, vars=None):
         """Compiled log probability density gradient function"""
-        return self.model.fn(gradient(self.logpt, vars))
+        return self._compiled_logp_fn("fn", self.logpt, gradient, vars)
 
     def d2logp(self, vars=None):
         """Compiled log probability density hessian function"""
-        return self.model.fn(hessian(self.logpt, vars))
+        return self._compiled_logp_fn("fn", self.logpt, hessian, vars)
 
     @property
     def logp_nojac(self):
-        return self.model.fn(self.logp_nojact)
+        return self._compiled_logp_fn("fn", self.logp_nojact)
 
     def dlogp_nojac(self, vars=None):
         """Compiled log density gradient function, without jacobian terms."""
-        return self.model.fn(gradient(self.logp_nojact, vars))
+        return self._compiled_logp_fn("fn", self.logp_nojact, gradient, vars)
 
     def d2logp_nojac(self, vars=None):
         """Compiled log density hessian function, without jacobian terms."""
-        return self.model.fn(hessian(self.logp_nojact, vars))
+        return self._compiled_logp_fn("fn", self.logp_nojact, hessian, vars)
 
     @property
     def fastlogp(self):
         """Compiled log probability density function"""
-        return self.model.fastfn(self.logpt)
+        return self._compiled_logp_fn("fastfn", self.logpt)
 
     def fastdlogp(self, vars=None):
         """Compiled log probability density gradient function"""
-        return self.model.fastfn(gradient(self.logpt, vars))
+        return self._compiled_logp_fn("fastfn", self.logpt, gradient, vars)
 
     def fastd2logp(self, vars=None):
         """Compiled log probability density hessian function"""
-        return self.model.fastfn(hessian(self.logpt, vars))
+        return self._compiled_logp_fn("fastfn", self.logpt, hessian, vars)
 
     @property
     def fastlogp_nojac(self):
-        return self.model.fastfn(self.logp_nojact)
+        return self._compiled_logp_fn("fastfn", self.logp_nojact)
 
     def fastdlogp_nojac(self, vars=None):
         """Compiled log density gradient function, without jacobian terms."""
-        return self.model.fastfn(gradient(self.logp_nojact, vars))
+        return self._compiled_logp_fn("fastfn", self.logp_nojact, gradient, vars)
 
     def fastd2logp_nojac(self, vars=None):
         """Compiled log density hessian function, without jacobian terms."""
-        return self.model.fastfn(hessian(self.logp_nojact, vars))
+        return self._compiled_logp_fn("fastfn", self.logp_nojact, hessian, vars)
 
     @property
     def logpt(self):
@@ -348,6 +401,32 @@ class Factor:
         return logp
 
 
+def _sum_factors(factors):
+    """Add up the summed log-probability terms with a single n-ary addition."""
+    # Scalar terms, like the ones returned by `logpt_sum`, need no reduction
+    terms = [factor if factor.ndim == 0 else at.sum(factor) for factor in factors]
+    if not terms:
+        return at.sum(terms)
+    return at.add(*terms)
+
+
+# Compiled logp-only functions and the shared variables of their extra inputs,
+# keyed by their graph, inputs, extra variables and mode.
+_logp_function_cache = LRUCache(maxsize=32)
+
+
+def _without_gc(mode):
+    """Return a copy of the given compilation mode with garbage collection disabled.
+
+    Modes whose linker can't be cloned with an ``allow_gc`` setting are returned
+    as they are.
+    """
+    mode = get_mode(mode)
+    if "allow_gc" not in inspect.signature(mode.linker.clone).parameters:
+        return mode
+    return mode.clone(link_kwargs={"allow_gc": False})
+
+
 class ValueGradFunction:
     """Create an Aesara function that computes a value and its gradient.
 
@@ -371,6 +450,13 @@ class ValueGradFunction:
         back from the array dtype to the variable dtype.
     compute_grads: bool, default=True
         If False, return only the logp, not the gradient.
+    mode: str or Mode, optional
+        The Aesara compilation mode. Defaults to `aesara.config.mode`.
+        If ``"NUMBA"`` or ``"JAX"`` is requested but the backend is unavailable or
+        cannot compile one of the Ops in the graph, the default mode is used instead.
+    grad_var_shapes: list of tuples, optional
+        The shapes of `grad_vars`. If given, the graph is specialized to these
+        shapes, and the function has to be rebuilt if they change.
     kwargs
         Extra arguments are passed on to `aesara.function`.
 
@@ -391,6 +477,8 @@ class ValueGradFunction:
         dtype=None,
         casting="no",
         compute_grads=True,
+        mode=None,
+        grad_var_shapes=None,
         **kwargs,
     ):
         if extra_vars_and_values is None:
@@ -403,6 +491,8 @@ class ValueGradFunction:
             raise ValueError("Names of the arguments are not unique.")
 
         self._grad_vars = grad_vars
+        self._point_map_info = None
+        self._unravel_slices = None
         self._extra_vars = list(extra_vars_and_values.keys())
         self._extra_var_names = {var.name for var in extra_vars_and_values.keys()}
 
@@ -417,10 +507,10 @@ class ValueGradFunction:
         self._weights = aesara.shared(weights, "__weights")
 
         cost = costs[0]
-        for i, val in enumerate(costs[1:]):
-            if cost.ndim > 0 or val.ndim > 0:
+        if self._n_costs > 1:
+            if any(val.ndim > 0 for val in costs):
                 raise ValueError("All costs must be scalar.")
-            cost = cost + self._weights[i] * val
+            cost = cost + at.dot(self._weights, at.stack(costs[1:]))
 
         self._extra_are_set = False
         for var in self._grad_vars:
@@ -435,26 +525,88 @@ class ValueGradFunction:
                     f"floating point but is {var.dtype}."
                 )
 
+        if grad_var_shapes is not None:
+            # Let the shape inference constant-fold the shapes of the inputs
+            cost = clone_replace(
+                cost,
+                {
+                    var: at.specify_shape(var, shape)
+                    for var, shape in zip(grad_vars, grad_var_shapes)
+                },
+            )
+
         givens = []
         self._extra_vars_shared = {}
         for var, value in extra_vars_and_values.items():
+            value = np.asarray(value, dtype=var.dtype, order="C")
             shared = aesara.shared(
                 value, var.name + "_shared__", broadcastable=[s == 1 for s in value.shape]
             )
             self._extra_vars_shared[var.name] = shared
             givens.append((var, shared))
+        self._extra_setters = [
+            (var.name, self._extra_vars_shared[var.name].set_value) for var in self._extra_vars
+        ]
 
         if compute_grads:
             grads = grad(cost, grad_vars, disconnected_inputs="ignore")
             for grad_wrt, var in zip(grads, grad_vars):
                 grad_wrt.name = f"{var.name}_grad"
-            outputs = [cost] + grads
+            # Return the gradient already raveled, so that it does not have to be
+            # concatenated outside of the compiled function on every call.
+            outputs = [cost]
+            if grads:
+                outputs.append(at.cast(at.concatenate([g.ravel() for g in grads]), self.dtype))
         else:
             outputs = [cost]
+        self._returns_grad = len(outputs) > 1
 
         inputs = grad_vars
 
-        self._aesara_function = compile_rv_inplace(inputs, outputs, givens=givens, **kwargs)
+        # Functions that only compute the logp of a graph are reused, as long as
+        # they are built with the same inputs and extra variables. The copy of a
+        # cached function reads the extra values from this instance's shared variables.
+        cache_key = None
+        if not compute_grads and self._n_costs == 1 and not kwargs:
+            if mode is None or isinstance(mode, str):
+                cache_key = (
+                    costs[0],
+                    tuple(grad_vars),
+                    tuple((var, shared.type) for var, shared in givens),
+                    mode,
+                    None if grad_var_shapes is None else tuple(map(tuple, grad_var_shapes)),
+                )
+        cached = None if cache_key is None else _logp_function_cache.get(cache_key)
+
+        if cached is not None:
+            aesara_function, cached_shared = cached
+            swap = {old: new for old, (_, new) in zip(cached_shared, givens) if old is not new}
+            if swap:
+                aesara_function = aesara_function.copy(swap=swap)
+        else:
+            # The function is called repeatedly with inputs of the same shapes, so
+            # keep the intermediate storage allocated between calls.
+            try:
+                aesara_function = compile_rv_inplace(
+                    inputs, outputs, givens=givens, mode=_without_gc(mode), **kwargs
+                )
+            except (ImportError, NotImplementedError) as e:
+                if mode not in ("NUMBA", "JAX"):
+                    raise
+                warnings.warn(
+                    f"Could not compile the logp function with the {mode} backend ({e}). "
+                    "Falling back to the default compilation mode."
+                )
+                aesara_function = compile_rv_inplace(
+                    inputs, outputs, givens=givens, mode=_without_gc(None), **kwargs
+                )
+            if cache_key is not None:
+                _logp_function_cache[cache_key] = (
+                    aesara_function,
+                    tuple(shared for _, shared in givens),
+                )
+
+        self._aesara_function = aesara_function
 
     def set_weights(self, values):
         if values.shape != (self._n_costs - 1,):
@@ -462,9 +614,14 @@ class ValueGradFunction:
         self._weights.set_value(values)
 
     def set_extra_values(self, extra_vars):
+        """Set the values of the extra variables.
+
+        The arrays are used without being copied, so they should not be
+        modified in place while the function is in use.
+        """
         self._extra_are_set = True
-        for var in self._extra_vars:
-            self._extra_vars_shared[var.name].set_value(extra_vars[var.name])
+        for name, set_value in self._extra_setters:
+            set_value(extra_vars[name], borrow=True)
 
     def get_extra_values(self):
         if not self._extra_are_set:
@@ -472,6 +629,25 @@ class ValueGradFunction:
 
         return {var.name: self._extra_vars_shared[var.name].get_value() for var in self._extra_vars}
 
+    def _unravel(self, array):
+        """Split a `RaveledVars` into the positional inputs of the compiled function."""
+        point_map_info = array.point_map_info
+        if point_map_info != self._point_map_info:
+            unravel_slices = []
+            last_idx = 0
+            for _, shape, dtype in point_map_info:
+                arr_len = np.prod(shape, dtype=int)
+                unravel_slices.append((slice(last_idx, last_idx + arr_len), shape, dtype))
+                last_idx += arr_len
+            self._point_map_info = point_map_info
+            self._unravel_slices = unravel_slices
+
+        data = array.data
+        return [
+            data[idx].reshape(shape).astype(dtype, copy=False)
+            for idx, shape, dtype in self._unravel_slices
+        ]
+
     def __call__(self, grad_vars, grad_out=None, extra_vars=None):
         if extra_vars is not None:
             self.set_extra_values(extra_vars)
@@ -480,23 +656,25 @@ class ValueGradFunction:
             raise ValueError("Extra values are not set.")
 
         if isinstance(grad_vars, RaveledVars):
-            grad_vars = list(DictToArrayBijection.rmap(grad_vars).values())
-
-        cost, *grads = self._aesara_function(*grad_vars)
+            grad_vars = self._unravel(grad_vars)
+        else:
+            grad_vars = [np.asarray(gv) for gv in grad_vars]
 
-        if grads:
-            grads_raveled = DictToArrayBijection.map(
-                {v.name: gv for v, gv in zip(self._grad_vars, grads)}
-            )
+        if not self._returns_grad:
+            (cost,) = self._aesara_function(*grad_vars)
+            return cost
 
-            if grad_out is None:
-                return cost, grads_raveled.data
-            else:
-                np.copyto(grad_out, grads_raveled.data)
-                return cost
+        cost, grads_raveled = self._aesara_function(*grad_vars)
+        if grad_out is None:
+            return cost, grads_raveled
         else:
+            np.copyto(grad_out, grads_raveled)
             return cost
 
+    def free(self):
+        """Release the intermediate storage kept by the compiled function."""
+        self._aesara_function.free()
+
     @property
     def profile(self):
         """Profiling information of the underlying Aesara function."""
@@ -651,8 +829,8 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
 
         if self.parent is not None:
             self.named_vars = treedict(parent=self.parent.named_vars)
-            self.values_to_rvs = treedict(parent=self.parent.values_to_rvs)
             self.rvs_to_values = treedict(parent=self.parent.rvs_to_values)
+            self.rvs_to_transforms = treedict(parent=self.parent.rvs_to_transforms)
             self.free_RVs = treelist(parent=self.parent.free_RVs)
             self.observed_RVs = treelist(parent=self.parent.observed_RVs)
             self.auto_deterministics = treelist(parent=self.parent.auto_deterministics)
@@ -660,13 +838,25 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
             self.potentials = treelist(parent=self.parent.potentials)
         else:
             self.named_vars = treedict()
-            self.values_to_rvs = treedict()
             self.rvs_to_values = treedict()
+            self.rvs_to_transforms = treedict()
             self.free_RVs = treelist()
             self.observed_RVs = treelist()
             self.auto_deterministics = treelist()
             self.deterministics = treelist()
             self.potentials = treelist()
+        self.values_to_rvs = _InverseMap(self.rvs_to_values)
+
+        self._logpt_cache = None
+        self._logp_nojact_cache = None
+        self._value_potentials_cache = None
+        self._value_vars_cache = None
+        self._unobserved_value_vars_cache = None
+        self._independent_vars_cache = None
+        self._graph_inputs_cache = None
+        self._initial_point_cache = None
+        self._point_logps_fn_cache = None
+        self._start_val_forward_fns = {}
 
     @property
     def model(self):
@@ -689,9 +879,11 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
 
     @property
     def ndim(self):
-        return sum(var.ndim for var in self.value_vars)
+        return self._value_vars_info()[2]
 
-    def logp_dlogp_function(self, grad_vars=None, tempered=False, **kwargs):
+    def logp_dlogp_function(
+        self, grad_vars=None, tempered=False, specialize_shapes=False, **kwargs
+    ):
         """Compile an Aesara function that computes logp and gradient.
 
         Parameters
@@ -702,6 +894,10 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         tempered: bool
             Compute the tempered logp `free_logp + alpha * observed_logp`.
             `alpha` can be changed using `ValueGradFunction.set_weights([alpha])`.
+        specialize_shapes: bool
+            Specialize the graph to the shapes of the variables in the initial point.
+            Only use this if the shapes of the free random variables do not depend on
+            data that can be changed with `set_data`.
         """
         if grad_vars is None:
             grad_vars = [v.tag.value_var for v in typefilter(self.free_RVs, continuous_types)]
@@ -715,50 +911,76 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
 
         if tempered:
             with self:
-                # Convert random variables into their log-likelihood inputs and
-                # apply their transforms, if any
-                potentials, _ = rvs_to_value_vars(self.potentials, apply_transforms=True)
-
-                free_RVs_logp = at.sum(
-                    [at.sum(logpt(var, self.rvs_to_values.get(var, None))) for var in self.free_RVs]
-                    + list(potentials)
+                free_RVs_logp = _sum_factors(
+                    [logpt(var, self.rvs_to_values.get(var, None)) for var in self.free_RVs]
+                    + list(self._value_potentials())
                 )
-                observed_RVs_logp = at.sum(
-                    [at.sum(logpt(obs, obs.tag.observations)) for obs in self.observed_RVs]
+                observed_RVs_logp = _sum_factors(
+                    [logpt(obs, obs.tag.observations) for obs in self.observed_RVs]
                 )
 
             costs = [free_RVs_logp, observed_RVs_logp]
         else:
             costs = [self.logpt]
 
-        input_vars = {i for i in graph_inputs(costs) if not isinstance(i, Constant)}
+        initial_point = self.initial_point
+        input_vars = self._graph_input_vars(costs)
         extra_vars = [self.rvs_to_values.get(var, var) for var in self.free_RVs]
         extra_vars_and_values = {
-            var: self.initial_point[var.name]
+            var: initial_point[var.name]
             for var in extra_vars
             if var in input_vars and var not in grad_vars
         }
+        if specialize_shapes and all(var.name in initial_point for var in grad_vars):
+            kwargs.setdefault(
+                "grad_var_shapes", [np.shape(initial_point[var.name]) for var in grad_vars]
+            )
         return ValueGradFunction(costs, grad_vars, extra_vars_and_values, **kwargs)
 
+    def _graph_input_vars(self, costs):
+        """Return the non-constant inputs of `costs`, reusing the result for the last graphs."""
+        cached = self._graph_inputs_cache
+        if (
+            cached is None
+            or len(cached[0]) != len(costs)
+            or any(a is not b for a, b in zip(cached[0], costs))
+        ):
+            input_vars = {i for i in graph_inputs(costs) if not isinstance(i, Constant)}
+            cached = self._graph_inputs_cache = (tuple(costs), input_vars)
+        return cached[1]
+
+    def _value_potentials(self):
+        """Return the potentials in terms of the (transformed) value variables."""
+        n_potentials = len(self.potentials)
+        if self._value_potentials_cache is None or self._value_potentials_cache[0] != n_potentials:
+            # Convert random variables into their log-likelihood inputs and
+            # apply their transforms, if any
+            potentials, _ = rvs_to_value_vars(self.potentials, apply_transforms=True)
+            self._value_potentials_cache = (n_potentials, potentials)
+        return self._value_potentials_cache[1]
+
     @property
     def logpt(self):
         """Aesara scalar of log-probability of the model"""
+        # The graph only changes when variables are added to the model
+        cache_key = (len(self.free_RVs), len(self.observed_RVs), len(self.potentials))
+        if self._logpt_cache is not None and self._logpt_cache[0] == cache_key:
+            return self._logpt_cache[1]
+
         with self:
             factors = [logpt_sum(var, self.rvs_to_values.get(var, None)) for var in self.free_RVs]
             factors += [logpt_sum(obs, obs.tag.observations) for obs in self.observed_RVs]
 
-            # Convert random variables into their log-likelihood inputs and
-            # apply their transforms, if any
-            potentials, _ = rvs_to_value_vars(self.potentials, apply_transforms=True)
-
-            factors += potentials
+            factors += self._value_potentials()
 
-            logp_var = at.sum([at.sum(factor) for factor in factors])
+            logp_var = _sum_factors(factors)
             if self.name:
                 logp_var.name = f"__logp_{self.name}"
             else:
                 logp_var.name = "__logp"
-            return logp_var
+
+        self._logpt_cache = (cache_key, logp_var)
+        return logp_var
 
     @property
     def logp_nojact(self):
@@ -768,47 +990,46 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         Note that if there is no transformed variable in the model, logp_nojact
         will be the same as logpt as there is no need for Jacobian correction.
         """
+        cache_key = (len(self.free_RVs), len(self.observed_RVs), len(self.potentials))
+        if self._logp_nojact_cache is not None and self._logp_nojact_cache[0] == cache_key:
+            return self._logp_nojact_cache[1]
+
         with self:
             factors = [
-                logpt_sum(var, getattr(var.tag, "value_var", None), jacobian=False)
+                logpt_sum(var, self.rvs_to_values.get(var, None), jacobian=False)
                 for var in self.free_RVs
             ]
             factors += [
                 logpt_sum(obs, obs.tag.observations, jacobian=False) for obs in self.observed_RVs
             ]
 
-            # Convert random variables into their log-likelihood inputs and
-            # apply their transforms, if any
-            potentials, _ = rvs_to_value_vars(self.potentials, apply_transforms=True)
-            factors += potentials
+            factors += self._value_potentials()
 
-            logp_var = at.sum([at.sum(factor) for factor in factors])
+            logp_var = _sum_factors(factors)
 
             if self.name:
                 logp_var.name = f"__logp_nojac_{self.name}"
             else:
                 logp_var.name = "__logp_nojac"
-            return logp_var
+
+        self._logp_nojact_cache = (cache_key, logp_var)
+        return logp_var
 
     @property
     def varlogpt(self):
         """Aesara scalar of log-probability of the unobserved random variables
         (excluding deterministic)."""
         with self:
-            factors = [logpt_sum(var, getattr(var.tag, "value_var", None)) for var in self.free_RVs]
-            return at.sum(factors)
+            factors = [logpt_sum(var, self.rvs_to_values.get(var, None)) for var in self.free_RVs]
+            return _sum_factors(factors)
 
     @property
     def datalogpt(self):
         with self:
-            factors = [logpt(obs, obs.tag.observations) for obs in self.observed_RVs]
-
-            # Convert random variables into their log-likelihood inputs and
-            # apply their transforms, if any
-            potentials, _ = rvs_to_value_vars(self.potentials, apply_transforms=True)
+            factors = [logpt_sum(obs, obs.tag.observations) for obs in self.observed_RVs]
 
-            factors += [at.sum(factor) for factor in potentials]
-            return at.sum(factors)
+            factors += self._value_potentials()
+            return _sum_factors(factors)
 
     @property
     def vars(self):
@@ -818,12 +1039,20 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         )
         return self.value_vars
 
+    def _value_vars_info(self):
+        """Return the number of free variables, their value variables and their total ndim."""
+        n_free = len(self.free_RVs)
+        if self._value_vars_cache is None or self._value_vars_cache[0] != n_free:
+            value_vars = [self.rvs_to_values[v] for v in self.free_RVs]
+            self._value_vars_cache = (n_free, value_vars, sum(var.ndim for var in value_vars))
+        return self._value_vars_cache
+
     @property
     def value_vars(self):
         """List of unobserved random variables used as inputs to the model's
         log-likelihood (which excludes deterministics).
         """
-        return [self.rvs_to_values[v] for v in self.free_RVs]
+        return list(self._value_vars_info()[1])
 
     @property
     def unobserved_value_vars(self):
@@ -831,22 +1060,29 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         as well as deterministics used as inputs and outputs of the the model's
         log-likelihood graph
         """
-        vars = []
-        for rv in self.free_RVs:
-            value_var = self.rvs_to_values[rv]
-            transform = getattr(value_var.tag, "transform", None)
-            if transform is not None:
-                # We need to create and add an un-transformed version of
-                # each transformed variable
-                untrans_value_var = transform.backward(rv, value_var)
-                untrans_value_var.name = rv.name
-                vars.append(untrans_value_var)
-            vars.append(value_var)
-
-        # Remove rvs from deterministics graph
-        deterministics, _ = rvs_to_value_vars(self.deterministics, apply_transforms=True)
-
-        return vars + deterministics
+        # The graphs only change when variables are added to the model
+        cache_key = (len(self.free_RVs), len(self.deterministics))
+        if (
+            self._unobserved_value_vars_cache is None
+            or self._unobserved_value_vars_cache[0] != cache_key
+        ):
+            vars = []
+            for rv in self.free_RVs:
+                value_var = self.rvs_to_values[rv]
+                transform = self.rvs_to_transforms.get(rv)
+                if transform is not None:
+                    # We need to create and add an un-transformed version of
+                    # each transformed variable
+                    untrans_value_var = transform.backward(rv, value_var)
+                    untrans_value_var.name = rv.name
+                    vars.append(untrans_value_var)
+                vars.append(value_var)
+
+            # Remove rvs from deterministics graph
+            deterministics, _ = rvs_to_value_vars(self.deterministics, apply_transforms=True)
+
+            self._unobserved_value_vars_cache = (cache_key, vars + deterministics)
+        return list(self._unobserved_value_vars_cache[1])
 
     @property
     def basic_RVs(self):
@@ -901,7 +1137,11 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         with `aesara.function`).  If you want the corresponding log-likelihood terms,
         use `var.tag.value_var`.
         """
-        return inputvars(self.unobserved_RVs)
+        # The graphs only change when variables are added to the model
+        cache_key = (len(self.free_RVs), len(self.deterministics))
+        if self._independent_vars_cache is None or self._independent_vars_cache[0] != cache_key:
+            self._independent_vars_cache = (cache_key, inputvars(self.unobserved_RVs))
+        return list(self._independent_vars_cache[1])
 
     @property
     def test_point(self):
@@ -913,7 +1153,12 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
 
     @property
     def initial_point(self):
-        return Point(list(self.initial_values.items()), model=self)
+        # Building the point resolves every variable name, so keep it around
+        # until `set_initval` changes the initial values.
+        if self._initial_point_cache is None:
+            self._initial_point_cache = Point(list(self.initial_values.items()), model=self)
+        # Callers are free to modify the point they get
+        return {name: value.copy() for name, value in self._initial_point_cache.items()}
 
     @property
     def disc_vars(self):
@@ -933,7 +1178,7 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         )
 
         rv_value_var = self.rvs_to_values[rv_var]
-        transform = getattr(rv_value_var.tag, "transform", None)
+        transform = self.rvs_to_transforms.get(rv_var)
 
         if initval is None or transform:
             # Sample/evaluate this using the existing initial values, and
@@ -951,7 +1196,7 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
             def initval_to_rvval(value_var, value):
                 rv_var = self.values_to_rvs[value_var]
                 initval = value_var.type.make_constant(value)
-                transform = getattr(value_var.tag, "transform", None)
+                transform = self.rvs_to_transforms.get(rv_var)
                 if transform:
                     return transform.backward(rv_var, initval)
                 else:
@@ -967,6 +1212,7 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
             initval = initval_fn()
 
         self.initial_values[rv_value_var] = initval
+        self._initial_point_cache = None
 
     def next_rng(self) -> RandomStateSharedVariable:
         """Generate a new ``RandomStateSharedVariable``.
@@ -1032,7 +1278,12 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
                 f"The `length` passed for the '{name}' coord must be an Aesara Variable or None."
             )
         if name in self.coords:
-            if not values.equals(self.coords[name]):
+            existing = self.coords[name]
+            if (
+                values is not existing
+                and not (hasattr(values, "equals") and values.equals(existing))
+                and not np.array_equal(np.asarray(values), np.asarray(existing))
+            ):
                 raise ValueError(f"Duplicate and incompatible coordinate: {name}.")
         else:
             self._coords[name] = values
@@ -1074,6 +1325,13 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
             Must be provided for all named dimensions that change in length
             and already have coordinate values.
         """
+        self._apply_set_data(*self._prepare_set_data(name, values, coords))
+
+    def _prepare_set_data(self, name, values, coords=None):
+        """Validates new values for a data variable, without changing the model.
+
+        Returns the arguments for `_apply_set_data`.
+        """
         shared_object = self[name]
         if not isinstance(shared_object, SharedVariable):
             raise TypeError(
@@ -1086,6 +1344,8 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         values = pandas_to_array(values)
         dims = self.RV_dims.get(name, None) or ()
         coords = coords or {}
+        coord_updates = {}
+        length_updates = []
 
         if values.ndim != shared_object.ndim:
             raise ValueError(
@@ -1094,7 +1354,11 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
 
         for d, dname in enumerate(dims):
             length_tensor = self.dim_lengths[dname]
-            old_length = length_tensor.eval()
+            # Shared lengths can be read without compiling a function
+            if isinstance(length_tensor, SharedVariable):
+                old_length = length_tensor.get_value(borrow=True)
+            else:
+                old_length = length_tensor.eval()
             new_length = values.shape[d]
             original_coords = self.coords.get(dname, None)
             new_coords = coords.get(dname, None)
@@ -1104,16 +1368,17 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
             # Reject resizing if we already know that it would create shape problems.
             # NOTE: If there are multiple pm.Data containers sharing this dim, but the user only
             #       changes the values for one of them, they will run into shape problems nonetheless.
-            length_belongs_to = length_tensor.owner.inputs[0].owner.inputs[0]
-            if not isinstance(length_belongs_to, SharedVariable) and length_changed:
-                raise ShapeError(
-                    f"Resizing dimension '{dname}' with values of length {new_length} would lead to incompatibilities, "
-                    f"because the dimension was initialized from '{length_belongs_to}' which is not a shared variable. "
-                    f"Check if the dimension was defined implicitly before the shared variable '{name}' was created, "
-                    f"for example by a model variable.",
-                    actual=new_length,
-                    expected=old_length,
-                )
+            if length_changed and not isinstance(length_tensor, SharedVariable):
+                length_belongs_to = length_tensor.owner.inputs[0].owner.inputs[0]
+                if not isinstance(length_belongs_to, SharedVariable):
+                    raise ShapeError(
+                        f"Resizing dimension '{dname}' with values of length {new_length} would lead to incompatibilities, "
+                        f"because the dimension was initialized from '{length_belongs_to}' which is not a shared variable. "
+                        f"Check if the dimension was defined implicitly before the shared variable '{name}' was created, "
+                        f"for example by a model variable.",
+                        actual=new_length,
+                        expected=old_length,
+                    )
             if original_coords is not None and length_changed:
                 if length_changed and new_coords is None:
                     raise ValueError(
@@ -1129,10 +1394,18 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
                         actual=len(new_coords),
                         expected=new_length,
                     )
-                self._coords[dname] = new_coords
+                coord_updates[dname] = new_coords
             if isinstance(length_tensor, ScalarSharedVariable) and new_length != old_length:
-                # Updating the shared variable resizes dependent nodes that use this dimension for their `size`.
-                length_tensor.set_value(new_length)
+                length_updates.append((length_tensor, new_length))
+
+        return shared_object, values, coord_updates, length_updates
+
+    def _apply_set_data(self, shared_object, values, coord_updates, length_updates):
+        """Applies new values for a data variable that were validated by `_prepare_set_data`."""
+        self._coords.update(coord_updates)
+        for length_tensor, new_length in length_updates:
+            # Updating the shared variable resizes dependent nodes that use this dimension for their `size`.
+            length_tensor.set_value(new_length)
 
         shared_object.set_value(values)
 
@@ -1248,13 +1521,21 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
             # We can get a random variable comprised of only the unobserved
             # entries by lifting the indices through the `RandomVariable` `Op`.
 
-            masked_rv_var = rv_var[mask.nonzero()]
+            mask_idx = mask.nonzero()
+            antimask_idx = (~mask).nonzero()
 
-            fgraph = FunctionGraph(
-                [i for i in graph_inputs((masked_rv_var,)) if not isinstance(i, Constant)],
-                [masked_rv_var],
-                clone=False,
-            )
+            masked_rv_var = rv_var[mask_idx]
+            unmasked_rv_var = rv_var[antimask_idx]
+            unmasked_rv_var = unmasked_rv_var.owner.clone().default_output()
+
+            # Both subsets share the inputs of `rv_var`, so only walk the graph once
+            rv_inputs = [
+                i
+                for i in graph_inputs((masked_rv_var, unmasked_rv_var))
+                if not isinstance(i, Constant)
+            ]
+
+            fgraph = FunctionGraph(rv_inputs, [masked_rv_var], clone=False)
 
             (missing_rv_var,) = local_subtensor_rv_lift.transform(fgraph, fgraph.outputs[0].owner)
 
@@ -1266,16 +1547,9 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
             # The end result is two disjoint distributions: one for the missing
             # values, and another for the non-missing values.
 
-            antimask_idx = (~mask).nonzero()
             nonmissing_data = at.as_tensor_variable(data[antimask_idx])
-            unmasked_rv_var = rv_var[antimask_idx]
-            unmasked_rv_var = unmasked_rv_var.owner.clone().default_output()
 
-            fgraph = FunctionGraph(
-                [i for i in graph_inputs((unmasked_rv_var,)) if not isinstance(i, Constant)],
-                [unmasked_rv_var],
-                clone=False,
-            )
+            fgraph = FunctionGraph(rv_inputs, [unmasked_rv_var], clone=False)
             (observed_rv_var,) = local_subtensor_rv_lift.transform(fgraph, fgraph.outputs[0].owner)
             observed_rv_var.name = f"{name}_observed"
 
@@ -1287,7 +1561,7 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
 
             # Create deterministic that combines observed and missing
             rv_var = at.zeros(data.shape)
-            rv_var = at.set_subtensor(rv_var[mask.nonzero()], missing_rv_var)
+            rv_var = at.set_subtensor(rv_var[mask_idx], missing_rv_var)
             rv_var = at.set_subtensor(rv_var[antimask_idx], observed_rv_var)
             rv_var = Deterministic(name, rv_var, self, dims, auto=True)
 
@@ -1319,7 +1593,8 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         """
         value_var = rv_var.type()
 
-        if aesara.config.compute_test_value != "off":
+        compute_test_value = aesara.config.compute_test_value != "off"
+        if compute_test_value:
             value_var.tag.test_value = rv_var.tag.test_value
 
         value_var.name = rv_var.name
@@ -1331,15 +1606,17 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         if transform is UNSET and rv_var.owner:
             transform = logp_transform(rv_var.owner.op)
 
-        if transform is not None and transform is not UNSET:
+        if transform is UNSET:
+            transform = None
+        if transform is not None:
             value_var.tag.transform = transform
             value_var.name = f"{value_var.name}_{transform.name}__"
-            if aesara.config.compute_test_value != "off":
+            if compute_test_value:
                 value_var.tag.test_value = transform.forward(rv_var, value_var).tag.test_value
             self.named_vars[value_var.name] = value_var
 
         self.rvs_to_values[rv_var] = value_var
-        self.values_to_rvs[value_var] = rv_var
+        self.rvs_to_transforms[rv_var] = transform
 
         return value_var
 
@@ -1355,40 +1632,50 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
             self._RV_dims[var.name] = dims
 
         self.named_vars[var.name] = var
-        if not hasattr(self, self.name_of(var.name)):
-            setattr(self, self.name_of(var.name), var)
+        # Look the name up on the class, so that properties aren't evaluated
+        name = self.name_of(var.name)
+        if name not in self.__dict__ and not hasattr(type(self), name):
+            setattr(self, name, var)
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = name
+        # The prefix is looked up for every named variable access
+        self._prefix = f"{name}_" if name else ""
 
     @property
     def prefix(self):
-        return f"{self.name}_" if self.name else ""
+        return self._prefix
 
     def name_for(self, name):
         """Checks if name has prefix and adds if needed"""
-        if self.prefix:
-            if not name.startswith(self.prefix):
-                return f"{self.prefix}{name}"
-            else:
-                return name
+        prefix = self._prefix
+        if prefix and not name.startswith(prefix):
+            return f"{prefix}{name}"
         else:
             return name
 
     def name_of(self, name):
         """Checks if name has prefix and deletes if needed"""
-        if not self.prefix or not name:
-            return name
-        elif name.startswith(self.prefix):
-            return name[len(self.prefix) :]
+        prefix = self._prefix
+        if prefix and name and name.startswith(prefix):
+            return name[len(prefix) :]
         else:
             return name
 
     def __getitem__(self, key):
-        try:
-            return self.named_vars[key]
-        except KeyError as e:
-            try:
-                return self.named_vars[self.name_for(key)]
-            except KeyError:
-                raise e
+        named_vars = self.named_vars
+        var = named_vars.get(key)
+        if var is None:
+            # Fall back to the prefixed name, e.g. inside a named submodel
+            var = named_vars.get(self.name_for(key))
+            if var is None:
+                raise KeyError(key)
+        return var
 
     def makefn(self, outs, mode=None, *args, **kwargs):
         """Compiles an Aesara function which returns ``outs`` and takes the variable
@@ -1419,6 +1706,10 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         """Compiles an Aesara function which returns the values of ``outs``
         and takes values of model vars as arguments.
 
+        The compiled function is reused by later calls with the same outputs
+        and mode, as long as no variables were added to the model in between
+        and no extra compilation arguments are given.
+
         Parameters
         ----------
         outs: Aesara variable or iterable of Aesara variables
@@ -1428,12 +1719,16 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         -------
         Compiled Aesara function
         """
-        return LoosePointFunc(self.makefn(outs, mode, *args, **kwargs), self)
+        return LoosePointFunc(self._makefn_or_cached(outs, mode, *args, **kwargs), self)
 
     def fastfn(self, outs, mode=None, *args, **kwargs):
         """Compiles an Aesara function which returns ``outs`` and takes values
         of model vars as a dict as an argument.
 
+        The compiled function is reused by later calls with the same outputs
+        and mode, as long as no variables were added to the model in between
+        and no extra compilation arguments are given.
+
         Parameters
         ----------
         outs: Aesara variable or iterable of Aesara variables
@@ -1443,9 +1738,24 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         -------
         Compiled Aesara function as point function.
         """
-        f = self.makefn(outs, mode, *args, **kwargs)
+        f = self._makefn_or_cached(outs, mode, *args, **kwargs)
         return FastPointFunc(f)
 
+    def _makefn_or_cached(self, outs, mode=None, *args, **kwargs):
+        """Compile ``outs`` with `makefn`, reusing an earlier compilation when possible.
+
+        Functions compiled with extra arguments are not reused.
+        """
+        if args or kwargs or not (mode is None or isinstance(mode, str)):
+            return self.makefn(outs, mode, *args, **kwargs)
+        # The value variables are part of the key, because they are the inputs
+        # of the function and change when variables are added to the model
+        return self._cached_makefn(outs, mode, tuple(self.value_vars))
+
+    @locally_cachedmethod
+    def _cached_makefn(self, outs, mode, value_vars):
+        return self.makefn(outs, mode)
+
     def profile(self, outs, n=1000, point=None, profile=True, *args, **kwargs):
         """Compiles and profiles an Aesara function which returns ``outs`` and
         takes values of model vars as a dict as an argument.
@@ -1470,8 +1780,16 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         if point is None:
             point = self.initial_point
 
+        # Validate the inputs once, so that the calls being profiled don't
+        # pay for the conversion of the same values over and over again
+        inputs = [
+            i.variable.type.filter(point[i.variable.name], allow_downcast=True)
+            for i in f.maker.inputs
+            if not i.implicit
+        ]
+        f.trust_input = True
         for _ in range(n):
-            f(**point)
+            f(*inputs)
 
         return f.profile
 
@@ -1508,10 +1826,18 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         replacements = {}
         last_idx = 0
         for var in vars:
-            arr_len = at.prod(var.shape, dtype="int64")
-            replacements[self.named_vars[var.name]] = (
-                inputvar[last_idx : (last_idx + arr_len)].reshape(var.shape).astype(var.dtype)
-            )
+            # Avoid `Prod`, `Reshape` and `Cast` nodes where they aren't needed
+            if var.ndim == 0:
+                arr_len = 1
+                flat_var = inputvar[last_idx]
+            else:
+                arr_len = var.shape[0] if var.ndim == 1 else at.mul(*var.shape)
+                flat_var = inputvar[last_idx : (last_idx + arr_len)]
+                if var.ndim > 1:
+                    flat_var = flat_var.reshape(var.shape)
+            if var.dtype != inputvar.dtype:
+                flat_var = flat_var.astype(var.dtype)
+            replacements[self.named_vars[var.name]] = flat_var
             last_idx += arr_len
 
         flat_view = FlatView(inputvar, replacements)
@@ -1522,9 +1848,12 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         r"""Update point `a` with `b`, without overwriting existing keys.
 
         Values specified for transformed variables in `a` will be recomputed
-        conditional on the valures of `b` and stored in `b`.
+        conditional on the values of `b`. `b` itself is not modified.
 
         """
+        # The recomputed values take precedence over the ones in `b`, both
+        # for updating `a` and as inputs of the transforms that follow
+        b = collections.ChainMap({}, b)
         # TODO FIXME XXX: If we're going to incrementally update transformed
         # variables, we should do it in topological order.
         for a_name, a_value in tuple(a.items()):
@@ -1533,18 +1862,38 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
             var = self.named_vars.get(a_name, None)
             value_var = self.rvs_to_values.get(var, None)
             if value_var:
-                transform = getattr(value_var.tag, "transform", None)
+                transform = self.rvs_to_transforms.get(var)
                 if transform:
-                    fval_graph = transform.forward(var, a_value)
-                    (fval_graph,), _ = rvs_to_value_vars((fval_graph,), apply_transforms=True)
-                    fval_graph_inputs = {i: b[i.name] for i in inputvars(fval_graph) if i.name in b}
-                    rv_var_value = fval_graph.eval(fval_graph_inputs)
-                    # Why are these transformed values stored in `b`?  They're
-                    # not going to be used to update `a`.
+                    a_value = np.asarray(a_value)
+                    forward_fn, fval_graph_inputs = self._start_val_forward_fn(
+                        var, value_var, a_value
+                    )
+                    rv_var_value = forward_fn(a_value, *(b[i.name] for i in fval_graph_inputs))
                     b[value_var.name] = rv_var_value
 
         a.update({k: v for k, v in b.items() if k not in a})
 
+    def _start_val_forward_fn(self, var, value_var, value):
+        """Compile the forward transform of a start value of `var`, or reuse a compiled one.
+
+        Returns the compiled function and the model variables it takes as
+        inputs after the start value itself.
+        """
+        value_type = at.as_tensor_variable(value).type
+        key = (value_var, value_type)
+        if key not in self._start_val_forward_fns:
+            value_input = value_type()
+            fval_graph = self.rvs_to_transforms[var].forward(var, value_input)
+            (fval_graph,), _ = rvs_to_value_vars((fval_graph,), apply_transforms=True)
+            fval_graph_inputs = [
+                i
+                for i in inputvars(fval_graph)
+                if i is not value_input and not isinstance(i, (Constant, SharedVariable))
+            ]
+            forward_fn = aesara.function([value_input] + fval_graph_inputs, fval_graph)
+            self._start_val_forward_fns[key] = (forward_fn, fval_graph_inputs)
+        return self._start_val_forward_fns[key]
+
     def check_start_vals(self, start):
         r"""Check that the starting values for MCMC do not cause the relevant log probability
         to evaluate to something invalid (e.g. Inf or NaN)
@@ -1570,19 +1919,22 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         None
         """
         start_points = [start] if isinstance(start, dict) else start
+        dtypes = {name: var.dtype for name, var in self.named_vars.items()}
         for elem in start_points:
 
-            for k, v in elem.items():
-                elem[k] = np.asarray(v, dtype=self[k].dtype)
-
-            if not set(elem.keys()).issubset(self.named_vars.keys()):
-                extra_keys = ", ".join(set(elem.keys()) - set(self.named_vars.keys()))
+            extra_keys = elem.keys() - dtypes.keys()
+            if extra_keys:
                 valid_keys = ", ".join(self.named_vars.keys())
                 raise KeyError(
                     "Some start parameters do not appear in the model!\n"
-                    f"Valid keys are: {valid_keys}, but {extra_keys} was supplied"
+                    f"Valid keys are: {valid_keys}, but {', '.join(extra_keys)} was supplied"
                 )
 
+            for k, v in elem.items():
+                dtype = dtypes[k]
+                if not (isinstance(v, np.ndarray) and v.dtype == dtype):
+                    elem[k] = np.asarray(v, dtype=dtype)
+
             initial_eval = self.point_logps(point=elem)
 
             if not np.all(np.isfinite(initial_eval)):
@@ -1607,8 +1959,8 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         point: Point
             Point to be evaluated.  If ``None``, then ``model.initial_point``
             is used.
-        round_vals: int
-            Number of decimals to round log-probabilities
+        round_vals: int, optional
+            Number of decimals to round log-probabilities. If ``None``, they are not rounded.
 
         Returns
         -------
@@ -1617,14 +1969,22 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
         if point is None:
             point = self.initial_point
 
+        rvs = self.basic_RVs
+        # Compile a single function for all the terms, and only once per set of variables
+        cache_key = (len(self.free_RVs), len(self.observed_RVs))
+        if self._point_logps_fn_cache is None or self._point_logps_fn_cache[0] != cache_key:
+            # Only the observed variables carry observations
+            logps = [logpt_sum(rv, None) for rv in self.free_RVs]
+            logps += [logpt_sum(obs, obs.tag.observations) for obs in self.observed_RVs]
+            self._point_logps_fn_cache = (cache_key, self.fn(logps) if logps else None)
+        logps_fn = self._point_logps_fn_cache[1]
+
+        values = np.array(logps_fn(point) if logps_fn is not None else [])
+        if round_vals is not None:
+            values = np.round(values, round_vals)
+
         return Series(
-            {
-                rv.name: np.round(
-                    self.fn(logpt_sum(rv, getattr(rv.tag, "observations", None)))(point),
-                    round_vals,
-                )
-                for rv in self.basic_RVs
-            },
+            {rv.name: value for rv, value in zip(rvs, values)},
             name="Log-probability of test_point",
         )
 
@@ -1646,19 +2006,18 @@ class Model(Factor, WithMemoization, metaclass=ContextMeta):
                 "\\\\".join(rv_reprs)
             )
         else:
-            rv_reprs = [rv.__str__() for rv in all_rv]
-            rv_reprs = [
-                rv_repr for rv_repr in rv_reprs if "TransformedDistribution()" not in rv_repr
-            ]
-            # align vars on their ~
-            names = [s[: s.index("~") - 1] for s in rv_reprs]
-            distrs = [s[s.index("~") + 2 :] for s in rv_reprs]
-            maxlen = str(max(len(x) for x in names))
-            rv_reprs = [
-                ("{name:>" + maxlen + "} ~ {distr}").format(name=n, distr=d)
-                for n, d in zip(names, distrs)
-            ]
-            return "\n".join(rv_reprs)
+            names = []
+            distrs = []
+            for rv in all_rv:
+                rv_repr = rv.__str__()
+                if "TransformedDistribution()" in rv_repr:
+                    continue
+                # align vars on their ~
+                idx = rv_repr.index("~")
+                names.append(rv_repr[: idx - 1])
+                distrs.append(rv_repr[idx + 2 :])
+            maxlen = max((len(n) for n in names), default=0)
+            return "\n".join(f"{n:>{maxlen}} ~ {d}" for n, d in zip(names, distrs))
 
     def __str__(self, **kwargs):
         return self._str_repr(formatting="plain", **kwargs)
@@ -1710,8 +2069,11 @@ def set_data(new_data, model=None):
     """
     model = modelcontext(model)
 
-    for variable_name, new_value in new_data.items():
-        model.set_data(variable_name, new_value)
+    # All new values are validated before any of them is set, so that an
+    # invalid entry leaves the model unchanged
+    updates = [model._prepare_set_data(name, value) for name, value in new_data.items()]
+    for update in updates:
+        model._apply_set_data(*update)
 
 
 def fn(outs, mode=None, model=None, *args, **kwargs):
@@ -1732,7 +2094,7 @@ def fn(outs, mode=None, model=None, *args, **kwargs):
     return model.fn(outs, mode, *args, **kwargs)
 
 
-def fastfn(outs, mode=None, model=None):
+def fastfn(outs, mode=None, model=None, *args, **kwargs):
     """Compiles an Aesara function which returns ``outs`` and takes values of model
     vars as a dict as an argument.
 
@@ -1740,13 +2102,14 @@ def fastfn(outs, mode=None, model=None):
     ----------
     outs: Aesara variable or iterable of Aesara variables
     mode: Aesara compilation mode
+    model: Model, default=None
 
     Returns
     -------
     Compiled Aesara function as point function.
     """
     model = modelcontext(model)
-    return model.fastfn(outs, mode)
+    return model.fastfn(outs, mode, *args, **kwargs)
 
 
 def Point(*args, filter_model_vars=False, **kwargs):
@@ -1764,34 +2127,70 @@ def Point(*args, filter_model_vars=False, **kwargs):
         d = dict(*args, **kwargs)
     except Exception as e:
         raise TypeError(f"can't turn {args} and {kwargs} into a dict. {e}")
+    items = ((get_var_name(k), v) for k, v in d.items())
+    if filter_model_vars:
+        return _cast_point(items, _value_var_dtypes(model))
+    return {name: np.asarray(v) for name, v in items}
+
+
+def _value_var_dtypes(model):
+    """Map the names of the value variables of a model to the dtype of their values.
+
+    Continuous variables map to their own dtype and all others to None.
+    """
     return {
-        get_var_name(k): np.array(v)
-        for k, v in d.items()
-        if not filter_model_vars or (get_var_name(k) in map(get_var_name, model.value_vars))
+        get_var_name(v): v.dtype if v.dtype in continuous_types else None for v in model.value_vars
     }
 
 
+def _cast_point(items, dtypes):
+    """Build a point from the (name, value) pairs whose names are in `dtypes`.
+
+    Values of continuous variables are converted to the variable's dtype
+    here, so that the compiled functions do not need to cast them.
+    """
+    return {name: np.asarray(v, dtype=dtypes[name]) for name, v in items if name in dtypes}
+
+
 class FastPointFunc:
     """Wraps so a function so it takes a dict of arguments instead of arguments."""
 
+    __slots__ = ("f", "_input_names")
+
     def __init__(self, f):
         self.f = f
+        # Resolve the input order once so that calls can be positional
+        inputs = getattr(getattr(f, "maker", None), "inputs", None)
+        if inputs is None:
+            self._input_names = None
+        else:
+            self._input_names = tuple(i.name for i in inputs if not i.implicit)
 
     def __call__(self, state):
-        return self.f(**state)
+        if self._input_names is None:
+            return self.f(**state)
+        return self.f(*[state[name] for name in self._input_names])
 
 
 class LoosePointFunc:
     """Wraps so a function so it takes a dict of arguments instead of arguments
     but can still take arguments."""
 
+    __slots__ = ("f", "model", "_var_dtypes")
+
     def __init__(self, f, model):
         self.f = f
         self.model = model
+        # The compiled function takes the value variables the model has now
+        self._var_dtypes = _value_var_dtypes(model)
 
     def __call__(self, *args, **kwargs):
-        point = Point(model=self.model, *args, filter_model_vars=True, **kwargs)
-        return self.f(**point)
+        try:
+            d = dict(*args, **kwargs)
+        except Exception as e:
+            raise TypeError(f"can't turn {args} and {kwargs} into a dict. {e}")
+        items = ((get_var_name(k), v) for k, v in d.items())
+        return self.f(**_cast_point(items, self._var_dtypes))
 
 
 compilef = fastfn
@@ -154,6 +154,42 @@ def jax_funcify_NumPyroNUTS(op, node, **kwargs):
     return _sample
 
 
+def get_jaxified_logp(model=None):
+    """Return a JAX-traceable function that computes the model log-probability.
+
+    The returned function takes a sequence with the values of ``model.value_vars``
+    and can be used, for instance, as the (negated) ``potential_fn`` of
+    ``numpyro.infer.NUTS``.
+    """
+    model = modelcontext(model)
+
+    shared_inputs = [v for v in graph_inputs([model.logpt]) if isinstance(v, SharedVariable)]
+    inputs, outputs = clone(model.value_vars + shared_inputs, [model.logpt], copy_inputs=False)
+    fgraph = FunctionGraph(inputs, outputs, clone=False)
+    MergeOptimizer().optimize(fgraph)
+
+    logp_fn = jax_funcify(fgraph)
+
+    if isinstance(logp_fn, (list, tuple)):
+        # This handles the new JAX backend, which always returns a tuple
+        logp_fn = logp_fn[0]
+
+    def logp_fn_wrap(x):
+        res = logp_fn(
+            *x,
+            # The shared values are passed as extra arguments
+            *(v.get_value(borrow=True, return_internal_type=True) for v in shared_inputs),
+        )
+
+        if isinstance(res, (list, tuple)):
+            # This handles the new JAX backend, which always returns a tuple
+            res = res[0]
+
+        return res
+
+    return logp_fn_wrap
+
+
 def sample_numpyro_nuts(
     draws=1000,
     tune=1000,
@@ -81,6 +81,8 @@ class BaseHMC(GradientSharedStep):
             An object that represents the Hamiltonian with methods `velocity`,
             `energy`, and `random` methods.
         **aesara_kwargs: passed to Aesara functions
+            For instance, ``mode="NUMBA"`` compiles the logp and gradient
+            function with the Numba backend, if it is available.
         """
         self._model = modelcontext(model)
 
@@ -90,7 +90,6 @@ class CpuLeapfrogIntegrator:
         q_new = state.q.data.copy()
         p_new = state.p.data.copy()
         v_new = np.empty_like(q_new)
-        q_new_grad = np.empty_like(q_new)
 
         dt = 0.5 * epsilon
 
@@ -106,7 +105,8 @@ class CpuLeapfrogIntegrator:
         p_new = RaveledVars(p_new, state.p.point_map_info)
         q_new = RaveledVars(q_new, state.q.point_map_info)
 
-        logp = self._logp_dlogp_func(q_new, grad_out=q_new_grad)
+        # The gradient is returned in a new array of the right dtype
+        logp, q_new_grad = self._logp_dlogp_func(q_new)
 
         # p_new = p_new + dt * q_new_grad
         axpy(q_new_grad, p_new.data, a=dt)
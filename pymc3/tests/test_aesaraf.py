@@ -17,16 +17,12 @@ from itertools import product
 import aesara
 import aesara.tensor as at
 import numpy as np
-import numpy.ma as ma
 import numpy.testing as npt
-import pandas as pd
 import pytest
-import scipy.sparse as sps
 
 from aesara.graph.basic import Constant, Variable, ancestors
 from aesara.tensor.random.basic import normal, uniform
 from aesara.tensor.random.op import RandomVariable
-from aesara.tensor.subtensor import AdvancedIncSubtensor, AdvancedIncSubtensor1
 from aesara.tensor.type import TensorType
 from aesara.tensor.var import TensorVariable
 
@@ -42,7 +38,6 @@ from pymc3.aesaraf import (
     walk_model,
 )
 from pymc3.exceptions import ShapeError
-from pymc3.vartypes import int_types
 
 FLOATX = str(aesara.config.floatX)
 INTX = str(_conversion_map[FLOATX])
@@ -123,62 +118,46 @@ class TestBroadcasting:
             pm.sample(tune=5, draws=7, cores=1, step=step, compute_convergence_checks=False)
 
 
-def _make_along_axis_idx(arr_shape, indices, axis):
-    # compute dimensions to iterate over
-    if str(indices.dtype) not in int_types:
-        raise IndexError("`indices` must be an integer array")
-    shape_ones = (1,) * indices.ndim
-    dest_dims = list(range(axis)) + [None] + list(range(axis + 1, indices.ndim))
-
-    # build a fancy index, consisting of orthogonal aranges, with the
-    # requested index inserted at the right location
-    fancy_index = []
-    for dim, n in zip(dest_dims, arr_shape):
-        if dim is None:
-            fancy_index.append(indices)
-        else:
-            ind_shape = shape_ones[:dim] + (-1,) + shape_ones[dim + 1 :]
-            fancy_index.append(np.arange(n).reshape(ind_shape))
-
-    return tuple(fancy_index)
-
-
-if hasattr(np, "take_along_axis"):
-    np_take_along_axis = np.take_along_axis
-else:
-
-    def np_take_along_axis(arr, indices, axis):
-        if arr.shape[axis] <= 32:
-            # We can safely test with numpy's choose
-            arr = np.moveaxis(arr, axis, 0)
-            indices = np.moveaxis(indices, axis, 0)
-            out = np.choose(indices, arr)
-            return np.moveaxis(out, 0, axis)
-        else:
-            # numpy's choose cannot handle such a large axis so we
-            # just use the implementation of take_along_axis. This is kind of
-            # cheating because our implementation is the same as the one below
-            if axis < 0:
-                _axis = arr.ndim + axis
-            else:
-                _axis = axis
-            if _axis < 0 or _axis >= arr.ndim:
-                raise ValueError(f"Supplied axis {axis} is out of bounds")
-            return arr[_make_along_axis_idx(arr.shape, indices, _axis)]
+# (shape, axis, samples) cases shared by the take_along_axis value and gradient tests
+TAKE_ALONG_AXIS_PARAMS = list(
+    product(
+        [
+            (1,),
+            (3,),
+            (3, 1),
+            (3, 2),
+            (1, 1),
+            (1, 2),
+            (40, 40),
+            (5, 1, 1),
+            (5, 1, 2),
+            (5, 3, 1),
+            (5, 3, 2),
+        ],
+        [0, -1],
+        [1, 10],
+    )
+)
 
 
 class TestTakeAlongAxis:
+    # Compilation mode of the tested functions. ``None`` uses ``aesara.config.mode``,
+    # so another backend can be tested through ``AESARA_FLAGS`` (e.g. ``mode=NUMBA``).
+    mode = None
+
     def setup_class(self):
         self.inputs_buffer = dict()
         self.output_buffer = dict()
         self.func_buffer = dict()
+        self.rng = np.random.default_rng(42)
 
     def _input_tensors(self, shape):
         ndim = len(shape)
         arr = TensorType(FLOATX, [False] * ndim)("arr")
         indices = TensorType(INTX, [False] * ndim)("indices")
-        arr.tag.test_value = np.zeros(shape, dtype=FLOATX)
-        indices.tag.test_value = np.zeros(shape, dtype=INTX)
+        # Zero-strided views, so that no memory is allocated for them
+        arr.tag.test_value = np.broadcast_to(np.zeros((), dtype=FLOATX), shape)
+        indices.tag.test_value = np.broadcast_to(np.zeros((), dtype=INTX), shape)
         return arr, indices
 
     def get_input_tensors(self, shape):
@@ -204,7 +183,7 @@ class TestTakeAlongAxis:
             return out
 
     def _function(self, arr, indices, out):
-        return aesara.function([arr, indices], [out])
+        return aesara.function([arr, indices], [out], mode=self.mode)
 
     def get_function(self, shape, axis):
         ndim = len(shape)
@@ -217,63 +196,31 @@ class TestTakeAlongAxis:
             self.func_buffer[(ndim, axis)] = func
             return func
 
-    @staticmethod
-    def get_input_values(shape, axis, samples):
-        arr = np.random.randn(*shape).astype(FLOATX)
+    def get_input_values(self, shape, axis, samples):
+        arr = self.rng.standard_normal(shape, dtype=FLOATX)
         size = list(shape)
         size[axis] = samples
         size = tuple(size)
-        indices = np.random.randint(low=0, high=shape[axis], size=size, dtype=INTX)
+        indices = self.rng.integers(low=0, high=shape[axis], size=size, dtype=INTX)
         return arr, indices
 
-    @pytest.mark.parametrize(
-        ["shape", "axis", "samples"],
-        product(
-            [
-                (1,),
-                (3,),
-                (3, 1),
-                (3, 2),
-                (1, 1),
-                (1, 2),
-                (40, 40),  # choose fails here
-                (5, 1, 1),
-                (5, 1, 2),
-                (5, 3, 1),
-                (5, 3, 2),
-            ],
-            [0, -1],
-            [1, 10],
-        ),
-        ids=str,
-    )
-    def test_take_along_axis(self, shape, axis, samples):
-        arr, indices = self.get_input_values(shape, axis, samples)
+    @pytest.fixture(params=TAKE_ALONG_AXIS_PARAMS, ids=str, scope="class")
+    def shape_axis_samples(self, request):
+        return request.param
+
+    @pytest.fixture(scope="class")
+    def input_values(self, shape_axis_samples):
+        # Shared by the value and the gradient tests
+        return self.get_input_values(*shape_axis_samples)
+
+    def test_take_along_axis(self, shape_axis_samples, input_values):
+        shape, axis, _ = shape_axis_samples
+        arr, indices = input_values
         func = self.get_function(shape, axis)
-        assert np.allclose(np_take_along_axis(arr, indices, axis=axis), func(arr, indices)[0])
-
-    @pytest.mark.parametrize(
-        ["shape", "axis", "samples"],
-        product(
-            [
-                (1,),
-                (3,),
-                (3, 1),
-                (3, 2),
-                (1, 1),
-                (1, 2),
-                (40, 40),  # choose fails here
-                (5, 1, 1),
-                (5, 1, 2),
-                (5, 3, 1),
-                (5, 3, 2),
-            ],
-            [0, -1],
-            [1, 10],
-        ),
-        ids=str,
-    )
-    def test_take_along_axis_grad(self, shape, axis, samples):
+        npt.assert_allclose(func(arr, indices)[0], np.take_along_axis(arr, indices, axis=axis))
+
+    def test_take_along_axis_grad(self, shape_axis_samples, input_values):
+        shape, axis, _ = shape_axis_samples
         if axis < 0:
             _axis = len(shape) + axis
         else:
@@ -284,20 +231,19 @@ class TestTakeAlongAxis:
             at.sum(self._output_tensor(t_arr ** 2, t_indices, axis)),
             t_arr,
         )
-        func = aesara.function([t_arr, t_indices], [t_out2])
+        func = self._function(t_arr, t_indices, t_out2)
 
         # Test that the gradient gives the same output as what is expected
-        arr, indices = self.get_input_values(shape, axis, samples)
+        arr, indices = input_values
         expected_grad = np.zeros_like(arr)
-        slicer = [slice(None)] * len(shape)
-        for i in range(indices.shape[axis]):
-            slicer[axis] = i
-            inds = indices[tuple(slicer)].reshape(shape[:_axis] + (1,) + shape[_axis + 1 :])
-            inds = _make_along_axis_idx(shape, inds, _axis)
-            expected_grad[inds] += 1
+        # Orthogonal aranges, with the indices inserted along the axis
+        fancy_index = list(np.ogrid[tuple(slice(0, n) for n in indices.shape)])
+        fancy_index[_axis] = indices
+        # Repeated indices must all be counted, which plain `+=` would not do
+        np.add.at(expected_grad, tuple(fancy_index), 1)
         expected_grad *= 2 * arr
         out = func(arr, indices)[0]
-        assert np.allclose(out, expected_grad)
+        npt.assert_allclose(out, expected_grad)
 
     @pytest.mark.parametrize("axis", [-4, 4], ids=str)
     def test_axis_failure(self, axis):
@@ -323,6 +269,7 @@ class TestTakeAlongAxis:
 
 
 def test_extract_obs_data():
+    from aesara.tensor.subtensor import AdvancedIncSubtensor, AdvancedIncSubtensor1
 
     with pytest.raises(TypeError):
         extract_obs_data(at.matrix())
@@ -374,6 +321,10 @@ def test_pandas_to_array(input_dtype):
     Ensure that pandas_to_array returns the dense array, masked array,
     graph variable, TensorVariable, or sparse matrix as appropriate.
     """
+    import numpy.ma as ma
+    import pandas as pd
+    import scipy.sparse as sps
+
     # Create the various inputs to the function
     sparse_input = sps.csr_matrix(np.eye(3)).astype(input_dtype)
     dense_input = np.arange(9).reshape((3, 3)).astype(input_dtype)
@@ -449,6 +400,8 @@ def test_pandas_to_array(input_dtype):
 
 
 def test_pandas_to_array_pandas_index():
+    import pandas as pd
+
     data = pd.Index([1, 2, 3])
     result = pandas_to_array(data)
     expected = np.array([1, 2, 3])
@@ -473,7 +426,7 @@ def test_walk_model():
     assert a in res
     assert c in res
 
-    res = list(walk_model((test_graph,), walk_past_rvs=True, stop_at_vars={e}))
+    res = list(walk_model((test_graph,), walk_past_rvs=True, stop_at_vars=frozenset({e})))
     assert a in res
     assert c not in res
 
@@ -507,25 +460,19 @@ def test_rvs_to_value_vars():
     b_output = log_add_output.owner.inputs[1]
     assert b_output == b_value_var
 
-    res_ancestors = list(walk_model((res,), walk_past_rvs=True))
-    res_rv_ancestors = [
-        v for v in res_ancestors if v.owner and isinstance(v.owner.op, RandomVariable)
-    ]
+    res_ancestors = set(walk_model((res,), walk_past_rvs=True))
 
     # There shouldn't be any `RandomVariable`s in the resulting graph
-    assert len(res_rv_ancestors) == 0
+    assert not any(v.owner and isinstance(v.owner.op, RandomVariable) for v in res_ancestors)
     assert b_value_var in res_ancestors
     assert c_value_var in res_ancestors
     assert a_value_var not in res_ancestors
 
     (res,), replaced = rvs_to_value_vars((d,), apply_transforms=True)
 
-    res_ancestors = list(walk_model((res,), walk_past_rvs=True))
-    res_rv_ancestors = [
-        v for v in res_ancestors if v.owner and isinstance(v.owner.op, RandomVariable)
-    ]
+    res_ancestors = set(walk_model((res,), walk_past_rvs=True))
 
-    assert len(res_rv_ancestors) == 0
+    assert not any(v.owner and isinstance(v.owner.op, RandomVariable) for v in res_ancestors)
     assert a_value_var in res_ancestors
     assert b_value_var in res_ancestors
     assert c_value_var in res_ancestors
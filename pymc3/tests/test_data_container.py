@@ -236,6 +236,28 @@ class TestData(SeededTest):
             pm.set_data({"beta": [1.1, 2.2, 3.3]}, model=model)
         error.match("The variable `beta` must be a `SharedVariable`")
 
+    def test_set_data_is_all_or_nothing(self):
+        with pm.Model() as model:
+            x = pm.Data("x", [1.0, 2.0, 3.0])
+            pm.Data("y", [1.0, 2.0, 3.0])
+
+        with pytest.raises(ValueError, match="must have 1 dimensions"):
+            pm.set_data({"x": [4.0, 5.0, 6.0], "y": [[1.0]]}, model=model)
+        np.testing.assert_array_equal(x.get_value(), [1.0, 2.0, 3.0])
+
+    def test_data_does_not_alias_user_arrays(self):
+        new_values = floatX(np.array([4.0, 5.0, 6.0]))
+        observed = floatX(np.array([1.0, 2.0, 3.0]))
+        with pm.Model() as model:
+            x = pm.Data("x", [1.0, 2.0, 3.0])
+            y = pm.Normal("y", observed=observed)
+
+        pm.set_data({"x": new_values}, model=model)
+        new_values[:] = 0
+        observed[:] = 0
+        np.testing.assert_array_equal(x.get_value(), [4.0, 5.0, 6.0])
+        np.testing.assert_array_equal(y.tag.observations.data, [1.0, 2.0, 3.0])
+
     @pytest.mark.xfail(reason="Depends on ModelGraph")
     def test_model_to_graphviz_for_model_with_data_container(self):
         with pm.Model() as model:
@@ -299,6 +321,15 @@ class TestData(SeededTest):
         assert isinstance(pmodel.dim_lengths["columns"], ScalarSharedVariable)
         assert pmodel.dim_lengths["columns"].eval() == 7
 
+        # Shared dimension lengths are resized together with the coords
+        pmodel.set_data(
+            "observations",
+            np.random.uniform(size=(3, N_cols)),
+            coords={"rows": ["R1", "R2", "R3"]},
+        )
+        assert pmodel.coords["rows"] == ["R1", "R2", "R3"]
+        assert pmodel.dim_lengths["rows"].eval() == 3
+
     def test_symbolic_coords(self):
         """
         In v4 dimensions can be created without passing coordinate values.
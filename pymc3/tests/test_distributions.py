@@ -2989,3 +2989,13 @@ def test_distinct_rvs():
         pp_samples_2 = pm.sample_prior_predictive(samples=2)
 
     assert np.array_equal(pp_samples["y"], pp_samples_2["y"])
+
+
+def test_old_random_interface_is_deprecated():
+    class OldDist(pm.Continuous):
+        def random(self, point=None, size=None):
+            return size
+
+    dist = object.__new__(OldDist)
+    with pytest.warns(DeprecationWarning, match="old `Distribution.random` interface"):
+        assert dist.random(size=3) == 3
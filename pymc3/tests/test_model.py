@@ -13,7 +13,9 @@
 #   limitations under the License.
 import pickle
 import unittest
+import warnings
 
+from copy import copy
 from functools import reduce
 
 import aesara
@@ -25,7 +27,10 @@ import numpy.testing as npt
 import pandas as pd
 import pytest
 import scipy.sparse as sps
+import scipy.stats as st
 
+from aesara.compile.mode import Mode
+from aesara.link.vm import VMLinker
 from aesara.tensor.random.op import RandomVariable
 from aesara.tensor.var import TensorConstant
 from numpy.testing import assert_almost_equal
@@ -33,10 +38,11 @@ from numpy.testing import assert_almost_equal
 import pymc3 as pm
 
 from pymc3 import Deterministic, Potential
+from pymc3.aesaraf import compile_rv_inplace, inputvars
 from pymc3.blocking import DictToArrayBijection, RaveledVars
 from pymc3.distributions import Normal, logpt_sum, transforms
 from pymc3.exceptions import ShapeError
-from pymc3.model import Point, ValueGradFunction
+from pymc3.model import LoosePointFunc, Point, ValueGradFunction
 from pymc3.tests.helpers import SeededTest
 
 
@@ -156,6 +162,18 @@ class TestNested:
             with pm.Model() as sub:
                 assert model is sub.root
 
+    def test_prefix(self):
+        model = pm.Model("sub")
+        assert model.prefix == "sub_"
+        assert model.name_for("x") == "sub_x"
+        assert model.name_for("sub_x") == "sub_x"
+        assert model.name_of("sub_x") == "x"
+        assert model.name_of("x") == "x"
+
+        model.name = ""
+        assert model.prefix == ""
+        assert model.name_for("x") == "x"
+
 
 class TestObserved:
     def test_observed_rv_fail(self):
@@ -200,6 +218,58 @@ def test_duplicate_vars():
             pm.Normal("a", transform=transforms.log)
     err.match("already exists")
 
+    with pytest.raises(ValueError) as err:
+        with pm.Model():
+            with pm.Model("sub"):
+                pm.Normal("a")
+            pm.Normal("sub_a")
+    err.match("already exists")
+
+
+def test_var_attributes():
+    with pm.Model() as model:
+        a = pm.Normal("a")
+        logpt = pm.Normal("logpt")
+    assert model.a is a
+    # Model attributes are not shadowed by variables
+    assert model.logpt is not logpt
+    assert model["logpt"] is logpt
+
+
+def test_add_coord_duplicates():
+    with pm.Model(coords={"city": ["A", "B"]}) as model:
+        model.add_coord("city", ["A", "B"])
+        model.add_coord("city", pd.Index(["A", "B"]))
+        with pytest.raises(ValueError, match="Duplicate and incompatible coordinate"):
+            model.add_coord("city", ["A", "C"])
+
+
+def test_point_filter_model_vars():
+    with pm.Model() as model:
+        x = pm.Normal("x")
+
+    point = Point({x: 1.0, "y": [2.0]}, model=model)
+    assert point == {"x": 1.0, "y": [2.0]}
+    assert isinstance(point["y"], np.ndarray)
+    point = Point({x: 1, "y": [2.0]}, model=model, filter_model_vars=True)
+    assert point == {"x": 1.0}
+    assert point["x"].dtype == x.dtype
+
+    value = np.array(1.0, dtype=x.dtype)
+    assert Point({"x": value}, model=model, filter_model_vars=True)["x"] is value
+
+
+def test_loose_point_func_casts_like_point():
+    with pm.Model() as model:
+        x = pm.Normal("x")
+        pm.Poisson("z", 1.0)
+
+    f = LoosePointFunc(lambda **point: point, model)
+    point = f({x: 1, "z": 2, "y": [2.0]})
+    assert point == Point({x: 1, "z": 2, "y": [2.0]}, model=model, filter_model_vars=True)
+    assert point["x"].dtype == x.dtype
+    assert point["z"].dtype == np.asarray(2).dtype
+
 
 def test_empty_observed():
     data = pd.DataFrame(np.ones((2, 3)) / 3)
@@ -216,6 +286,27 @@ class TestValueGradFunction(unittest.TestCase):
         f_grad = ValueGradFunction([a.sum()], [a], {}, mode="FAST_COMPILE")
         assert f_grad._extra_vars == []
 
+    def test_no_gc(self):
+        a = at.vector("a")
+        f_grad = ValueGradFunction([(a ** 2).sum()], [a], {})
+        assert not f_grad._aesara_function.fn.allow_gc
+        f_grad.set_extra_values({})
+        val, grad = f_grad([np.ones(3)])
+        assert val == 3
+        f_grad.free()
+        val, grad = f_grad([np.ones(3)])
+        assert val == 3
+
+    def test_inputs_are_converted(self):
+        a = at.dvector("a")
+        f_grad = ValueGradFunction([(a ** 2).sum()], [a], {})
+        f_grad.set_extra_values({})
+        val, grad = f_grad([np.array([1, 2, 3])])
+        assert val == 14
+        npt.assert_allclose(grad, [2, 4, 6])
+        with pytest.raises(TypeError):
+            f_grad([np.ones((3, 1))])
+
     def test_invalid_type(self):
         a = at.ivector("a")
         a.tag.test_value = np.zeros(3, dtype=a.dtype)
@@ -275,6 +366,61 @@ class TestValueGradFunction(unittest.TestCase):
         assert val == 21
         npt.assert_allclose(grad, [5, 5, 5, 1, 1, 1, 1, 1, 1])
 
+    def test_grad_var_shapes(self):
+        f_grad = ValueGradFunction(
+            [self.cost],
+            [self.val1, self.val2],
+            {self.extra1: self.extra1_},
+            grad_var_shapes=[(3,), (2, 3)],
+        )
+        f_grad.set_extra_values({"extra1": 5})
+        val, grad = f_grad([np.ones(3), np.ones((2, 3))])
+        assert val == 21
+        npt.assert_allclose(grad, [5, 5, 5, 1, 1, 1, 1, 1, 1])
+
+        with pytest.raises(AssertionError):
+            f_grad([np.ones(4), np.ones((2, 3))])
+
+    def test_extra_values_of_live_functions_are_independent(self):
+        f_grad = ValueGradFunction(
+            [self.cost], [self.val1, self.val2], {self.extra1: self.extra1_}, mode="FAST_COMPILE"
+        )
+        self.f_grad.set_extra_values({"extra1": 5})
+        f_grad.set_extra_values({"extra1": 2})
+        assert self.f_grad.get_extra_values()["extra1"] == 5
+        assert f_grad.get_extra_values()["extra1"] == 2
+
+        val, _ = self.f_grad([np.ones(3), np.ones((2, 3))])
+        assert val == 21
+        val, _ = f_grad([np.ones(3), np.ones((2, 3))])
+        assert val == 12
+
+    def test_numba_mode(self):
+        # Falls back to the default mode when numba is not available
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            f_grad = ValueGradFunction(
+                [self.cost], [self.val1, self.val2], {self.extra1: self.extra1_}, mode="NUMBA"
+            )
+        f_grad.set_extra_values({"extra1": 5})
+        val, grad = f_grad([np.ones(3), np.ones((2, 3))])
+        assert val == 21
+        npt.assert_allclose(grad, [5, 5, 5, 1, 1, 1, 1, 1, 1])
+
+    def test_linker_without_allow_gc(self):
+        class LinkerWithoutGCOption(VMLinker):
+            def clone(self):
+                return copy(self)
+
+        mode = Mode(linker=LinkerWithoutGCOption(), optimizer="fast_run")
+        f_grad = ValueGradFunction(
+            [self.cost], [self.val1, self.val2], {self.extra1: self.extra1_}, mode=mode
+        )
+        f_grad.set_extra_values({"extra1": 5})
+        val, grad = f_grad([np.ones(3), np.ones((2, 3))])
+        assert val == 21
+        npt.assert_allclose(grad, [5, 5, 5, 1, 1, 1, 1, 1, 1])
+
     @pytest.mark.xfail(reason="Test not refactored for v4")
     def test_edge_case(self):
         # Edge case discovered in #2948
@@ -402,6 +548,177 @@ def test_tempered_logp_dlogp():
     npt.assert_allclose(func_temp_nograd(x), func_temp(x)[0])
 
 
+def test_logp_dlogp_function_after_set_data():
+    with pm.Model() as model:
+        d = pm.Data("d", np.zeros(3))
+        pm.Normal("y", 0, 1, size=d.shape[0])
+
+    func_specialized = model.logp_dlogp_function(specialize_shapes=True)
+    func_specialized.set_extra_values({})
+    logp, dlogp = func_specialized([np.zeros(3)])
+    npt.assert_allclose(dlogp, np.zeros(3))
+
+    model.set_data("d", np.zeros(5))
+    func = model.logp_dlogp_function()
+    func.set_extra_values({})
+    logp, dlogp = func([np.zeros(5)])
+    npt.assert_allclose(logp, 5 * st.norm.logpdf(0))
+    npt.assert_allclose(dlogp, np.zeros(5))
+
+
+def test_logp_only_function_is_reused():
+    with pm.Model() as model:
+        pm.Normal("x")
+        pm.Normal("y", observed=1)
+
+    func1 = model.logp_dlogp_function(compute_grads=False)
+    func2 = model.logp_dlogp_function(compute_grads=False)
+    assert func1._aesara_function is func2._aesara_function
+
+    func_grad = model.logp_dlogp_function()
+    assert func_grad._aesara_function is not func1._aesara_function
+
+
+def test_logp_only_function_with_extra_vars_is_reused(monkeypatch):
+    with pm.Model() as model:
+        x = pm.Normal("x")
+        pm.Normal("y", x)
+    x_value = model.rvs_to_values[x]
+
+    compiled = []
+
+    def counting_compile(*args, **kwargs):
+        compiled.append(args)
+        return compile_rv_inplace(*args, **kwargs)
+
+    monkeypatch.setattr(pm.model, "compile_rv_inplace", counting_compile)
+    cache_size = len(pm.model._logp_function_cache)
+    func1 = model.logp_dlogp_function(grad_vars=[x_value], compute_grads=False)
+    func2 = model.logp_dlogp_function(grad_vars=[x_value], compute_grads=False)
+    assert len(compiled) == 1
+    assert len(pm.model._logp_function_cache) == cache_size + 1
+
+    # Each function reads the extra values of its own shared variables
+    func1.set_extra_values({"y": 0.0})
+    func2.set_extra_values({"y": 2.0})
+    npt.assert_allclose(func1([np.array(0.0)]), model.logp({"x": 0.0, "y": 0.0}))
+    npt.assert_allclose(func2([np.array(0.0)]), model.logp({"x": 0.0, "y": 2.0}))
+
+
+def test_logpt_is_cached():
+    with pm.Model() as model:
+        pm.Normal("x")
+        logp_x = model.logpt
+        assert model.logpt is logp_x
+
+        pm.Normal("y", observed=1)
+        assert model.logpt is not logp_x
+
+        pm.Potential("p", at.constant(-1.0))
+        potentials = model._value_potentials()
+        assert model._value_potentials() is potentials
+
+    npt.assert_allclose(
+        model.fastlogp({"x": 0.0}), st.norm.logpdf(0.0) + st.norm.logpdf(1.0) - 1, rtol=1e-6
+    )
+
+
+def test_rvs_to_transforms():
+    with pm.Model() as model:
+        x = pm.HalfNormal("x")
+        y = pm.Normal("y")
+        z = pm.Normal("z", observed=1)
+        with pm.Model("sub"):
+            w = pm.HalfNormal("w", transform=None)
+
+    assert model.rvs_to_transforms[x] is model.rvs_to_values[x].tag.transform
+    assert model.rvs_to_transforms[y] is None
+    assert model.rvs_to_transforms[w] is None
+    assert model.rvs_to_transforms[z] is None
+
+
+def test_unobserved_value_vars_are_cached():
+    with pm.Model() as model:
+        pm.HalfNormal("x")
+        vars = model.unobserved_value_vars
+        assert [v.name for v in vars] == ["x", "x_log__"]
+        assert all(a is b for a, b in zip(model.unobserved_value_vars, vars))
+
+        pm.Deterministic("y", model.x + 1)
+        assert [v.name for v in model.unobserved_value_vars] == ["x", "x_log__", "y"]
+
+
+def test_independent_vars_are_cached(monkeypatch):
+    calls = []
+
+    def counting_inputvars(a):
+        calls.append(a)
+        return inputvars(a)
+
+    monkeypatch.setattr(pm.model, "inputvars", counting_inputvars)
+    with pm.Model() as model:
+        pm.Normal("x")
+        assert model.independent_vars == []
+        assert model.independent_vars == []
+        assert len(calls) == 1
+
+        z = at.dscalar("z")
+        pm.Deterministic("y", model.x + z)
+        independent_vars = model.independent_vars
+        assert independent_vars == [z]
+        assert model.independent_vars == independent_vars
+        assert len(calls) == 2
+
+
+def test_flatten():
+    with pm.Model() as model:
+        pm.Normal("a")
+        pm.Normal("b", size=3)
+        pm.Normal("c", size=(2, 2))
+
+    flat_view = model.flatten()
+    outs = [flat_view.replacements[model[var.name]] for var in model.value_vars]
+    f = aesara.function([flat_view.input] + model.value_vars, outs, on_unused_input="ignore")
+    a, b, c = f(np.arange(8.0), 0.0, np.zeros(3), np.zeros((2, 2)))
+    npt.assert_array_equal(a, 0.0)
+    npt.assert_array_equal(b, [1.0, 2.0, 3.0])
+    npt.assert_array_equal(c, [[4.0, 5.0], [6.0, 7.0]])
+
+
+def test_compiled_logp_is_cached():
+    with pm.Model() as model:
+        x = pm.Normal("x")
+        logp = model.fastlogp
+        assert model.fastlogp is logp
+        assert model.fastdlogp([x]) is model.fastdlogp([x])
+        assert model.logp_nojac is model.logp_nojac
+
+        pm.Normal("y", observed=1)
+        assert model.fastlogp is not logp
+
+    npt.assert_allclose(
+        model.fastlogp({"x": 0.0}), st.norm.logpdf(0.0) + st.norm.logpdf(1.0), rtol=1e-6
+    )
+
+
+def test_compiled_fn_is_cached():
+    with pm.Model() as model:
+        x = pm.Normal("x")
+        d = pm.Deterministic("d", x + 1)
+        f = model.fastfn(d)
+        assert model.fastfn(d).f is f.f
+        assert model.fn(d).f is f.f
+        assert model.fastfn(d, profile=True).f is not f.f
+        assert pm.fastfn(d).f is f.f
+        assert pm.fn(d, model=model).f is f.f
+
+        y = pm.Normal("y")
+        assert model.fastfn(d).f is not f.f
+
+    x_value, y_value = model.rvs_to_values[x], model.rvs_to_values[y]
+    npt.assert_allclose(model.fastfn([x_value + 1, y_value])({"x": 1.0, "y": 3.0}), [2.0, 3.0])
+
+
 def test_model_pickle(tmpdir):
     """Tests that PyMC3 models are pickleable"""
     with pm.Model() as model:
@@ -426,6 +743,20 @@ def test_model_pickle_deterministic(tmpdir):
         pickle.dump(model, buff)
 
 
+def test_point_funcs_pickle():
+    with pm.Model() as model:
+        x = pm.Normal("x")
+        pm.Normal("y", observed=1)
+
+    # Compiling through the model fills its caches, which are not pickled
+    fast_logp = pickle.loads(pickle.dumps(model.fastlogp))
+    logp = pickle.loads(pickle.dumps(model.fn(model.logpt)))
+    expected = st.norm.logpdf(0.0) + st.norm.logpdf(1.0)
+    npt.assert_allclose(fast_logp({"x": 0.0}), expected, rtol=1e-6)
+    npt.assert_allclose(logp({"x": 0.0}), expected, rtol=1e-6)
+    pickle.loads(pickle.dumps(model))
+
+
 def test_model_vars():
     with pm.Model() as model:
         a = pm.Normal("a")
@@ -445,6 +776,12 @@ def test_model_var_maps():
     assert model.rvs_to_values == {a: a.tag.value_var, x: x.tag.value_var}
     assert model.values_to_rvs == {a.tag.value_var: a, x.tag.value_var: x}
 
+    with model:
+        with pm.Model("sub") as sub:
+            y = pm.Normal("y")
+    assert model.values_to_rvs[y.tag.value_var] is y
+    assert sub.values_to_rvs == {y.tag.value_var: y}
+
 
 def test_make_obs_var():
     """
@@ -537,6 +874,15 @@ def test_point_logps():
     assert "x" in logp_vals.keys()
     assert "a" in logp_vals.keys()
 
+    logps_fn = model._point_logps_fn_cache[1]
+    logp_vals = model.point_logps({"a_interval__": 0.0, "x": 1.0}, round_vals=None)
+    assert model._point_logps_fn_cache[1] is logps_fn
+    npt.assert_allclose(logp_vals["x"], st.norm.logpdf(1.0, 0.5), rtol=1e-6)
+
+    with model:
+        pm.Normal("y", observed=0.0)
+    assert "y" in model.point_logps().keys()
+
 
 class TestUpdateStartVals(SeededTest):
     def setup_method(self):
@@ -573,6 +919,13 @@ class TestUpdateStartVals(SeededTest):
         model.update_start_vals(start, test_point)
         assert_almost_equal(np.exp(start["a_log__"]), start["a"])
 
+        # The compiled forward transform is reused for new start values
+        forward_fns = dict(model._start_val_forward_fns)
+        start = {"a": 3.0}
+        model.update_start_vals(start, {"a_log__": 0})
+        assert_almost_equal(np.exp(start["a_log__"]), start["a"])
+        assert model._start_val_forward_fns == forward_fns
+
     def test_soft_update_parent(self):
         with pm.Model() as model:
             a = pm.Uniform("a", lower=0.0, upper=1.0)
@@ -595,6 +948,7 @@ class TestUpdateStartVals(SeededTest):
             "interv_interval__": 0.4519851237430569,
         }
         model.update_start_vals(start, initial_point)
+        assert all(value == 0.0 for value in initial_point.values())
         assert_almost_equal(start["lower_interval__"], test_point["lower_interval__"])
         assert_almost_equal(start["upper_interval__"], test_point["upper_interval__"])
         assert_almost_equal(start["interv_interval__"], test_point["interv_interval__"])
@@ -630,7 +984,7 @@ class TestCheckStartVals(SeededTest):
 
         start = {"a": 0.3, "b": 2.1, "c": 1.0}
         model.update_start_vals(start, model.initial_point)
-        with pytest.raises(KeyError):
+        with pytest.raises(KeyError, match="Some start parameters do not appear in the model"):
             model.check_start_vals(start)
 
 
@@ -656,3 +1010,20 @@ def test_set_initval():
         y = pm.Normal("y", x, 1)
 
     assert model.rvs_to_values[y] in model.initial_values
+
+
+def test_initial_point_is_cached():
+    with pm.Model() as model:
+        x = pm.Normal("x", initval=1.0)
+        point = model.initial_point
+        assert point == {"x": 1.0}
+
+        # Modifying the returned point doesn't affect the model
+        point["x"][...] = 2.0
+        assert model.initial_point == {"x": 1.0}
+
+        model.set_initval(x, 3.0)
+        assert model.initial_point == {"x": 3.0}
+
+        pm.Normal("y", initval=4.0)
+        assert model.initial_point == {"x": 3.0, "y": 4.0}
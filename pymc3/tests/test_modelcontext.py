@@ -14,6 +14,8 @@
 
 import threading
 
+import aesara
+
 from pytest import raises
 
 from pymc3 import Model, Normal
@@ -81,3 +83,13 @@ def test_mixed_contexts():
         Model.get_context(error_if_none=True)
     with raises((ValueError, TypeError)):
         modelcontext(None)
+
+
+def test_aesara_config():
+    floatX = aesara.config.floatX
+    with Model() as model:
+        assert model._config_context is None
+    with Model(aesara_config={"floatX": "float32"}) as model:
+        assert model._config_context is not None
+        assert aesara.config.floatX == "float32"
+    assert aesara.config.floatX == floatX
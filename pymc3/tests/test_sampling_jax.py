@@ -3,7 +3,7 @@ import numpy as np
 
 import pymc3 as pm
 
-from pymc3.sampling_jax import sample_numpyro_nuts
+from pymc3.sampling_jax import get_jaxified_logp, sample_numpyro_nuts
 
 
 def test_transform_samples():
@@ -33,3 +33,16 @@ def test_transform_samples():
 
     assert -11 < trace.posterior["a"].mean() < -8
     assert 1.5 < trace.posterior["sigma"].mean() < 2.5
+
+
+def test_get_jaxified_logp():
+    obs_at = aesara.shared(np.array([0.5, -0.3, 1.2]), borrow=True, name="obs")
+    with pm.Model() as model:
+        a = pm.Normal("a", 0, 1)
+        sigma = pm.HalfNormal("sigma")
+        b = pm.Normal("b", a, sigma=sigma, observed=obs_at)
+
+    logp_fn = get_jaxified_logp(model)
+    point = model.initial_point
+    res = logp_fn([point[v.name] for v in model.value_vars])
+    assert np.isclose(res, model.fastlogp(point))
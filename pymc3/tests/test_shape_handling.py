@@ -12,8 +12,13 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import warnings
+
+from functools import lru_cache
+
 import aesara
 import numpy as np
+import pandas as pd
 import pytest
 
 from aesara import tensor as at
@@ -28,6 +33,8 @@ from pymc3.distributions.shape_utils import (
     convert_shape,
     convert_size,
     get_broadcastable_dist_samples,
+    infer_implied_ndim,
+    resize_from_observed,
     shapes_broadcasting,
     to_tuple,
 )
@@ -61,14 +68,17 @@ test_sizes = [
     (1, 1, 1, 1),
 ]
 test_to_shapes = [None, tuple(), (10, 5, 4), (10, 1, 1, 5, 1)]
+# Test ids are formatted once here, instead of by pytest for every parametrization
+test_sizes_ids = [str(size) for size in test_sizes]
+test_shapes_ids = [str(shapes) for shapes in test_shapes]
 
 
-@pytest.fixture(params=test_sizes, ids=str)
+@pytest.fixture(params=test_sizes, ids=test_sizes_ids)
 def fixture_sizes(request):
     return request.param
 
 
-@pytest.fixture(params=test_shapes, ids=str)
+@pytest.fixture(params=test_shapes, ids=test_shapes_ids)
 def fixture_shapes(request):
     return request.param
 
@@ -78,36 +88,50 @@ def fixture_exception_handling(request):
     return request.param
 
 
-@pytest.fixture()
-def samples_to_broadcast(fixture_sizes, fixture_shapes):
-    samples = [np.empty(s) for s in fixture_shapes]
+@lru_cache(maxsize=None)
+def _broadcast_shape_or_none(shapes, size):
+    # Cached, because many of the `to_shape` cases broadcast the same shapes
     try:
-        broadcast_shape = broadcast_dist_samples_shape(fixture_shapes, size=fixture_sizes)
+        return broadcast_dist_samples_shape(list(shapes), size=size)
     except ValueError:
-        broadcast_shape = None
-    return fixture_sizes, samples, broadcast_shape
+        return None
 
 
-@pytest.fixture(params=test_to_shapes, ids=str)
-def samples_to_broadcast_to(request, samples_to_broadcast):
-    to_shape = request.param
-    size, samples, broadcast_shape = samples_to_broadcast
-    if broadcast_shape is not None:
-        try:
-            broadcast_shape = broadcast_dist_samples_shape(
-                [broadcast_shape, to_tuple(to_shape)], size=size
-            )
-        except ValueError:
-            broadcast_shape = None
-    return to_shape, size, samples, broadcast_shape
+# The expected broadcast shapes are computed once, at collection time
+samples_broadcast_cases = [
+    (size, shapes, _broadcast_shape_or_none(shapes, size))
+    for size in test_sizes
+    for shapes in test_shapes
+]
+samples_broadcast_to_cases = [
+    (
+        to_shape,
+        size,
+        shapes,
+        None
+        if broadcast_shape is None
+        else _broadcast_shape_or_none((broadcast_shape, to_tuple(to_shape)), size),
+    )
+    for size, shapes, broadcast_shape in samples_broadcast_cases
+    for to_shape in test_to_shapes
+]
+samples_broadcast_ids = ["-".join(map(str, case)) for case in samples_broadcast_cases]
+samples_broadcast_to_ids = ["-".join(map(str, case)) for case in samples_broadcast_to_cases]
+
 
+def _samples_of_shapes(shapes):
+    # Zero-strided views, so that no memory is allocated for the samples
+    return [np.broadcast_to(np.zeros(()), s) for s in shapes]
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def fixture_model():
-    with pm.Model() as model:
+    # The model is only read by its users, so it is built once per module.
+    # Its values are never checked against the bounds of the distributions.
+    with pm.Model(check_bounds=False) as model:
         n = 5
         dim = 4
-        with pm.Model():
+        with pm.Model(check_bounds=False):
             cov = pm.InverseGamma("cov", alpha=1, beta=1)
             x = pm.Normal("x", mu=np.ones((dim,)), sigma=pm.math.sqrt(cov), shape=(n, dim))
             eps = pm.HalfNormal("eps", np.ones((n, 1)), shape=(n, dim))
@@ -120,24 +144,39 @@ class TestShapesBroadcasting:
     @pytest.mark.parametrize(
         "bad_input",
         [None, [None], "asd", 3.6, {1: 2}, {3}, [8, [8]], "3", ["3"], np.array([[2]])],
-        ids=str,
+        ids=["None", "[None]", "asd", "3.6", "{1: 2}", "{3}", "[8, [8]]", "3", "['3']", "[[2]]"],
     )
-    def test_type_check_raises(self, bad_input):
-        with pytest.raises(TypeError):
-            shapes_broadcasting(bad_input, tuple(), raise_exception=True)
+    def test_type_check_raises(self, bad_input, fixture_exception_handling):
         with pytest.raises(TypeError):
-            shapes_broadcasting(bad_input, tuple(), raise_exception=False)
+            shapes_broadcasting(bad_input, tuple(), raise_exception=fixture_exception_handling)
 
     def test_type_check_success(self):
         inputs = [3, 3.0, tuple(), [3], (3,), np.array(3), np.array([3])]
         out = shapes_broadcasting(*inputs)
         assert out == (3,)
 
+    @pytest.mark.parametrize(
+        "shape, expected",
+        [
+            (None, ()),
+            (3, (3,)),
+            ((), ()),
+            ((2, 3), (2, 3)),
+            ([2, 3], (2, 3)),
+            (np.array(3), (3,)),
+            (np.array([2, 3]), (2, 3)),
+            (np.int64(3), (3,)),
+        ],
+        ids=["None", "int", "()", "tuple", "list", "0d-array", "1d-array", "int64"],
+    )
+    def test_to_tuple(self, shape, expected):
+        assert to_tuple(shape) == expected
+
     def test_broadcasting(self, fixture_shapes, fixture_exception_handling):
         shapes = fixture_shapes
         raise_exception = fixture_exception_handling
         try:
-            expected_out = np.broadcast(*[np.empty(s) for s in shapes]).shape
+            expected_out = np.broadcast(*[np.broadcast_to(0.0, s) for s in shapes]).shape
         except ValueError:
             expected_out = None
         if expected_out is None:
@@ -155,16 +194,14 @@ class TestShapesBroadcasting:
         size = fixture_sizes
         shapes = fixture_shapes
         size_ = to_tuple(size)
-        shapes_ = [
-            s if s[: min([len(size_), len(s)])] != size_ else s[len(size_) :] for s in shapes
-        ]
+        n_size = len(size_)
+        # Slicing clips at the length of the shape, so `s[:n_size]` is its leading part
+        shapes_ = [s if s[:n_size] != size_ else s[n_size:] for s in shapes]
         try:
-            expected_out = np.broadcast(*[np.empty(s) for s in shapes_]).shape
+            expected_out = np.broadcast(*[np.broadcast_to(0.0, s) for s in shapes_]).shape
         except ValueError:
             expected_out = None
-        if expected_out is not None and any(
-            s[: min([len(size_), len(s)])] == size_ for s in shapes
-        ):
+        if expected_out is not None and any(s[:n_size] == size_ for s in shapes):
             expected_out = size_ + expected_out
         if expected_out is None:
             with pytest.raises(ValueError):
@@ -175,8 +212,11 @@ class TestShapesBroadcasting:
 
 
 class TestSamplesBroadcasting:
-    def test_broadcast_distribution_samples(self, samples_to_broadcast):
-        size, samples, broadcast_shape = samples_to_broadcast
+    @pytest.mark.parametrize(
+        "size, shapes, broadcast_shape", samples_broadcast_cases, ids=samples_broadcast_ids
+    )
+    def test_broadcast_distribution_samples(self, size, shapes, broadcast_shape):
+        samples = _samples_of_shapes(shapes)
         if broadcast_shape is not None:
             outs = broadcast_distribution_samples(samples, size=size)
             assert all(o.shape == broadcast_shape for o in outs)
@@ -184,19 +224,23 @@ class TestSamplesBroadcasting:
             with pytest.raises(ValueError):
                 broadcast_distribution_samples(samples, size=size)
 
-    def test_get_broadcastable_dist_samples(self, samples_to_broadcast):
-        size, samples, broadcast_shape = samples_to_broadcast
+    @pytest.mark.parametrize(
+        "size, shapes, broadcast_shape", samples_broadcast_cases, ids=samples_broadcast_ids
+    )
+    def test_get_broadcastable_dist_samples(self, size, shapes, broadcast_shape):
+        samples = _samples_of_shapes(shapes)
         if broadcast_shape is not None:
             size_ = to_tuple(size)
+            n_size = len(size_)
             outs, out_shape = get_broadcastable_dist_samples(
                 samples, size=size, return_out_shape=True
             )
             assert out_shape == broadcast_shape
             for i, o in zip(samples, outs):
                 ishape = i.shape
-                if ishape[: min([len(size_), len(ishape)])] == size_:
+                if ishape[:n_size] == size_:
                     expected_shape = (
-                        size_ + (1,) * (len(broadcast_shape) - len(ishape)) + ishape[len(size_) :]
+                        size_ + (1,) * (len(broadcast_shape) - len(ishape)) + ishape[n_size:]
                     )
                 else:
                     expected_shape = ishape
@@ -206,8 +250,13 @@ class TestSamplesBroadcasting:
             with pytest.raises(ValueError):
                 get_broadcastable_dist_samples(samples, size=size)
 
-    def test_broadcast_dist_samples_to(self, samples_to_broadcast_to):
-        to_shape, size, samples, broadcast_shape = samples_to_broadcast_to
+    @pytest.mark.parametrize(
+        "to_shape, size, shapes, broadcast_shape",
+        samples_broadcast_to_cases,
+        ids=samples_broadcast_to_ids,
+    )
+    def test_broadcast_dist_samples_to(self, to_shape, size, shapes, broadcast_shape):
+        samples = _samples_of_shapes(shapes)
         if broadcast_shape is not None:
             outs = broadcast_dist_samples_to(to_shape, samples, size=size)
             assert all(o.shape == broadcast_shape for o in outs)
@@ -226,6 +275,21 @@ def test_sample_generate_values(fixture_model, fixture_sizes):
             assert prior[rv.name].shape == size + tuple(rv.distribution.shape)
 
 
+def _eval_shapes(*variables):
+    """Evaluates the shapes of several variables with one compiled function."""
+    return [tuple(shape) for shape in aesara.function([], [v.shape for v in variables])()]
+
+
+# Coordinate values by dimension length, as tuples so that models can't change them
+coord_values = {d: tuple(f"c_{i}" for i in range(d)) for d in range(6)}
+
+
+@lru_cache(maxsize=None)
+def _shared_mu(param_shape):
+    # The tests only read the shape of these, so they are shared between models
+    return aesara.shared(np.random.normal(size=param_shape))
+
+
 class TestShapeDimsSize:
     @pytest.mark.parametrize("param_shape", [(), (3,)])
     @pytest.mark.parametrize("batch_shape", [(), (3,)])
@@ -250,48 +314,46 @@ class TestShapeDimsSize:
         # Create coordinates corresponding to the parameter shape
         for d in param_shape:
             dname = f"param_dim_{d}"
-            coords[dname] = [f"c_{i}" for i in range(d)]
+            coords[dname] = coord_values[d]
             param_dims.append(dname)
         assert len(param_dims) == len(param_shape)
         # Create coordinates corresponding to the batch shape
         for d in batch_shape:
             dname = f"batch_dim_{d}"
-            coords[dname] = [f"c_{i}" for i in range(d)]
+            coords[dname] = coord_values[d]
             batch_dims.append(dname)
         assert len(batch_dims) == len(batch_shape)
 
         with pm.Model(coords=coords) as pmodel:
-            mu = aesara.shared(np.random.normal(size=param_shape))
-
-            with pytest.warns(None):
-                if parametrization == "implicit":
-                    rv = pm.Normal("rv", mu=mu).shape == param_shape
-                else:
-                    expected_shape = batch_shape + param_shape
-                    if parametrization == "shape":
-                        rv = pm.Normal("rv", mu=mu, shape=batch_shape + param_shape)
-                        assert rv.eval().shape == expected_shape
-                    elif parametrization == "shape...":
-                        rv = pm.Normal("rv", mu=mu, shape=(*batch_shape, ...))
-                        assert rv.eval().shape == batch_shape + param_shape
-                    elif parametrization == "dims":
-                        rv = pm.Normal("rv", mu=mu, dims=batch_dims + param_dims)
-                        assert rv.eval().shape == expected_shape
-                    elif parametrization == "dims...":
-                        rv = pm.Normal("rv", mu=mu, dims=(*batch_dims, ...))
-                        n_size = len(batch_shape)
-                        n_implied = len(param_shape)
-                        ndim = n_size + n_implied
-                        assert len(pmodel.RV_dims["rv"]) == ndim, pmodel.RV_dims
-                        assert len(pmodel.RV_dims["rv"][:n_size]) == len(batch_dims)
-                        assert len(pmodel.RV_dims["rv"][n_size:]) == len(param_dims)
-                        if n_implied > 0:
-                            assert pmodel.RV_dims["rv"][-1] is None
-                    elif parametrization == "size":
-                        rv = pm.Normal("rv", mu=mu, size=batch_shape + param_shape)
-                        assert rv.eval().shape == expected_shape
-                    else:
-                        raise NotImplementedError("Invalid test case parametrization.")
+            mu = _shared_mu(param_shape)
+
+            # Keyword arguments that define the shape of the variable for each parametrization
+            shape_kwargs = {
+                "implicit": {},
+                "shape": dict(shape=batch_shape + param_shape),
+                "shape...": dict(shape=(*batch_shape, ...)),
+                "dims": dict(dims=batch_dims + param_dims),
+                "dims...": dict(dims=(*batch_dims, ...)),
+                "size": dict(size=batch_shape + param_shape),
+            }[parametrization]
+
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                rv = pm.Normal("rv", mu=mu, **shape_kwargs)
+
+            if parametrization == "implicit":
+                assert tuple(rv.shape.eval()) == param_shape
+            elif parametrization == "dims...":
+                n_size = len(batch_shape)
+                n_implied = len(param_shape)
+                ndim = n_size + n_implied
+                assert len(pmodel.RV_dims["rv"]) == ndim, pmodel.RV_dims
+                assert len(pmodel.RV_dims["rv"][:n_size]) == len(batch_dims)
+                assert len(pmodel.RV_dims["rv"][n_size:]) == len(param_dims)
+                if n_implied > 0:
+                    assert pmodel.RV_dims["rv"][-1] is None
+            else:
+                assert tuple(rv.shape.eval()) == batch_shape + param_shape
 
     def test_define_dims_on_the_fly(self):
         with pm.Model() as pmodel:
@@ -305,12 +367,12 @@ class TestShapeDimsSize:
             # Use the dim to replicate a new RV
             effect = pm.Normal("effect", 0, dims=("patient",))
             assert effect.ndim == 1
-            assert effect.eval().shape == (3,)
+            assert tuple(effect.shape.eval()) == (3,)
 
             # Now change the length of the implied dimension
             agedata.set_value([1, 2, 3, 4])
             # The change should propagate all the way through
-            assert effect.eval().shape == (4,)
+            assert tuple(effect.shape.eval()) == (4,)
 
     @pytest.mark.xfail(reason="Simultaneous use of size and dims is not implemented")
     def test_data_defined_size_dimension_can_register_dimname(self):
@@ -328,15 +390,15 @@ class TestShapeDimsSize:
             x = pm.Data("x", [[1, 2, 3, 4]], dims=("first", "second"))
             y = pm.Normal("y", mu=0, dims=("first", "second"))
             z = pm.Normal("z", mu=y, observed=np.ones((1, 4)))
-            assert x.eval().shape == (1, 4)
-            assert y.eval().shape == (1, 4)
-            assert z.eval().shape == (1, 4)
+            assert tuple(x.shape.eval()) == (1, 4)
+            assert tuple(y.shape.eval()) == (1, 4)
+            assert tuple(z.shape.eval()) == (1, 4)
             assert "first" in pmodel.dim_lengths
             assert "second" in pmodel.dim_lengths
             pmodel.set_data("x", [[1, 2], [3, 4], [5, 6]])
-            assert x.eval().shape == (3, 2)
-            assert y.eval().shape == (3, 2)
-            assert z.eval().shape == (3, 2)
+            assert tuple(x.shape.eval()) == (3, 2)
+            assert tuple(y.shape.eval()) == (3, 2)
+            assert tuple(z.shape.eval()) == (3, 2)
 
     @pytest.mark.xfail(reason="https://github.com/pymc-devs/aesara/issues/390")
     def test_size32_doesnt_break_broadcasting():
@@ -372,16 +434,20 @@ class TestShapeDimsSize:
         mu = aesara.shared(np.array([1, 2, 3]))
         with pytest.raises(NotImplementedError, match="API is not supported"):
             pm.Normal.dist(mu=mu, dims=("town",))
-        assert pm.Normal.dist(mu=mu, shape=(3,)).eval().shape == (3,)
-        assert pm.Normal.dist(mu=mu, shape=(5, 3)).eval().shape == (5, 3)
-        assert pm.Normal.dist(mu=mu, shape=(7, ...)).eval().shape == (7, 3)
-        assert pm.Normal.dist(mu=mu, size=(3,)).eval().shape == (3,)
-        assert pm.Normal.dist(mu=mu, size=(4, 3)).eval().shape == (4, 3)
+        assert (
+            _eval_shapes(
+                pm.Normal.dist(mu=mu, shape=(3,)),
+                pm.Normal.dist(mu=mu, shape=(5, 3)),
+                pm.Normal.dist(mu=mu, shape=(7, ...)),
+                pm.Normal.dist(mu=mu, size=(3,)),
+                pm.Normal.dist(mu=mu, size=(4, 3)),
+            )
+            == [(3,), (5, 3), (7, 3), (3,), (4, 3)]
+        )
 
     def test_mvnormal_shape_size_difference(self):
         # Parameters add one batch dimension (4), shape is what you'd expect.
-        # Under the hood the shape(4, 3) becomes size=(4,) and the RV is initially
-        # created as (4, 4, 3). The internal ndim-check then recreates it with size=None.
+        # The parameters already imply all dimensions, so the RV is created without a size.
         rv = pm.MvNormal.dist(mu=np.ones((4, 3)), cov=np.eye(3), shape=(4, 3))
         assert rv.ndim == 2
         assert tuple(rv.shape.eval()) == (4, 3)
@@ -394,8 +460,7 @@ class TestShapeDimsSize:
         assert tuple(rv.shape.eval()) == (5, 4, 3)
 
         # parameters add 1 batch dimension (4), shape adds another (5)
-        # Under the hood the shape=(5, 4, 3) becomes size=(5, 4)
-        # The RV is initially created as (5, 4, 3, 4, 3) and then recreated and resized.
+        # The RV is created with its implied shape (4, 3) and then resized.
         rv = pm.MvNormal.dist(mu=np.ones((4, 3)), cov=np.eye(3), shape=(5, 4, 3))
         assert rv.ndim == 3
         assert tuple(rv.shape.eval()) == (5, 4, 3)
@@ -404,7 +469,8 @@ class TestShapeDimsSize:
         assert rv.ndim == 5
         assert tuple(rv.shape.eval()) == (6, 5, 4, 3, 2)
 
-        with pytest.warns(None):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
             rv = pm.MvNormal.dist(mu=[1, 2, 3], cov=np.eye(3), size=(5, 4))
             assert tuple(rv.shape.eval()) == (5, 4, 3)
 
@@ -416,6 +482,13 @@ class TestShapeDimsSize:
             rv = pm.MvNormal.dist(mu=np.ones((5, 4, 3)), cov=np.eye(3), size=(5, 4))
             assert tuple(rv.shape.eval()) == (5, 4, 5, 4, 3)
 
+    def test_infer_implied_ndim(self):
+        assert infer_implied_ndim([np.ones((4, 3)), np.eye(3)], pm.MvNormal.rv_op) == 2
+        assert infer_implied_ndim([[1, 2, 3], np.eye(3)], pm.MvNormal.rv_op) == 1
+        assert infer_implied_ndim([at.matrix("mu"), np.eye(3)], pm.MvNormal.rv_op) == 2
+        # The number of parameters does not match the `Op` signature
+        assert infer_implied_ndim([np.ones(3)], pm.MvNormal.rv_op) is None
+
     def test_convert_dims(self):
         assert convert_dims(dims="town") == ("town",)
         with pytest.raises(ValueError, match="must be a tuple, str or list"):
@@ -437,19 +510,51 @@ class TestShapeDimsSize:
         with pytest.raises(ValueError, match="cannot contain"):
             convert_size(size=(3, ...))
 
+    def test_convert_caches_hashable_inputs(self):
+        assert convert_shape([2, 3]) == (2, 3)
+        assert convert_shape((2, 3)) is convert_shape([2, 3])
+        assert convert_dims(["town", ...]) is convert_dims(("town", ...))
+        # Symbolic sizes are never cached, because they hash by identity.
+        size = at.lscalar("size")
+        assert convert_size(size)[0] is size
+        with pytest.raises(ValueError, match="cannot contain"):
+            convert_size(size=[3, ...])
+
+    def test_resize_from_observed_sees_mutations(self):
+        observed = pd.Series([1.0, 2.0, 3.0])
+        ndim_resize, resize_shape, _ = resize_from_observed(observed, 0)
+        assert (ndim_resize, resize_shape) == (1, (3,))
+
+        # Growing the object in place must be reflected by the next call
+        observed.loc[3] = 4.0
+        ndim_resize, resize_shape, _ = resize_from_observed(observed, 0)
+        assert (ndim_resize, resize_shape) == (1, (4,))
+
+        _, resize_shape, _ = resize_from_observed([[1.0, 2.0]], 1)
+        assert resize_shape == (1,)
+
     def test_lazy_flavors(self):
-        assert pm.Uniform.dist(2, [4, 5], size=[3, 2]).eval().shape == (3, 2)
-        assert pm.Uniform.dist(2, [4, 5], shape=[3, 2]).eval().shape == (3, 2)
         with pm.Model(coords=dict(town=["Greifswald", "Madrid"])):
-            assert pm.Normal("n1", mu=[1, 2], dims="town").eval().shape == (2,)
-            assert pm.Normal("n2", mu=[1, 2], dims=["town"]).eval().shape == (2,)
-
-    def test_invalid_flavors(self):
-        with pytest.raises(ValueError, match="Passing both"):
-            pm.Normal.dist(0, 1, shape=(3,), size=(3,))
+            assert (
+                _eval_shapes(
+                    pm.Uniform.dist(2, [4, 5], size=[3, 2]),
+                    pm.Uniform.dist(2, [4, 5], shape=[3, 2]),
+                    pm.Normal("n1", mu=[1, 2], dims="town"),
+                    pm.Normal("n2", mu=[1, 2], dims=["town"]),
+                )
+                == [(3, 2), (3, 2), (2,), (2,)]
+            )
 
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            dict(shape=(3,), size=(3,)),
+            dict(shape=(2,), dims=("town",)),
+            dict(dims=("town",), size=(2,)),
+        ],
+        ids=["shape-size", "shape-dims", "dims-size"],
+    )
+    def test_invalid_flavors(self, kwargs):
         with pm.Model():
             with pytest.raises(ValueError, match="Passing both"):
-                pm.Normal("n", shape=(2,), dims=("town",))
-            with pytest.raises(ValueError, match="Passing both"):
-                pm.Normal("n", dims=("town",), size=(2,))
+                pm.Normal("n", **kwargs)
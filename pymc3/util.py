@@ -33,10 +33,13 @@ UNSET = object()
 def withparent(meth):
     """Helper wrapper that passes calls to parent's instance"""
 
+    name = meth.__name__
+
     def wrapped(self, *args, **kwargs):
         res = meth(self, *args, **kwargs)
-        if getattr(self, "parent", None) is not None:
-            getattr(self.parent, meth.__name__)(*args, **kwargs)
+        parent = getattr(self, "parent", None)
+        if parent is not None:
+            getattr(parent, name)(*args, **kwargs)
         return res
 
     # Unfortunately functools wrapper fails
@@ -101,7 +104,12 @@ class treedict(dict):
         super().__init__(iterable, **kwargs)
         assert isinstance(parent, dict) or parent is None
         self.parent = parent
-        if self.parent is not None:
+        # Every item added to the tree ends up in its root, which
+        # makes it a flat view of the whole tree
+        if parent is None:
+            self.root = self
+        else:
+            self.root = getattr(parent, "root", parent)
             self.parent.update(self)
 
     # typechecking here works bad
@@ -110,12 +118,7 @@ class treedict(dict):
 
     def tree_contains(self, item):
         # needed for `add_random_variable` method
-        if isinstance(self.parent, treedict):
-            return dict.__contains__(self, item) or self.parent.tree_contains(item)
-        elif isinstance(self.parent, dict):
-            return dict.__contains__(self, item) or self.parent.__contains__(item)
-        else:
-            return dict.__contains__(self, item)
+        return dict.__contains__(self.root, item)
 
 
 def escape_latex(strng):
@@ -258,7 +261,12 @@ def get_repr_for_variable(variable, formatting="plain"):
 
 def get_var_name(var):
     """Get an appropriate, plain variable name for a variable."""
-    return getattr(var, "name", str(var))
+    if isinstance(var, str):
+        return var
+    try:
+        return var.name
+    except AttributeError:
+        return str(var)
 
 
 def get_transformed(z):
@@ -382,6 +390,12 @@ class WithMemoization:
     def __getstate__(self):
         state = self.__dict__.copy()
         state.pop("_cache", None)
+        # Newer versions of cachetools store the bound wrappers of cached
+        # methods on the instance, and these can't be pickled
+        class_dicts = [vars(c) for c in type(self).__mro__]
+        for name in list(state):
+            if any(getattr(d.get(name), "_locally_cached", False) for d in class_dicts):
+                del state[name]
         return state
 
     def __setstate__(self, state):
@@ -398,4 +412,6 @@ def locally_cachedmethod(f):
 
         return cf
 
-    return cachedmethod(self_cache_fn(f.__name__), key=hash_key)(f)
+    cached_f = cachedmethod(self_cache_fn(f.__name__), key=hash_key)(f)
+    cached_f._locally_cached = True
+    return cached_f